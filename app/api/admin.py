@@ -1,14 +1,19 @@
 """Admin API endpoints."""
 
+import asyncio
 import shutil
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, List, Tuple
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from fastapi.responses import FileResponse
 
-from app.dependencies import get_vector_store, get_document_store, get_retriever
+from app.dependencies import get_vector_store, get_document_store, get_retriever, get_query_cache
 from app.config import settings
+from app.utils.archive import async_targz, async_untargz
+from app.utils.fastcopy import fast_copy
 from app.utils.logging import get_logger
+from app.utils.serialization import dumps
 
 logger = get_logger(__name__)
 
@@ -23,17 +28,13 @@ async def create_backup(
 ):
     """Create a backup snapshot."""
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    snapshot_dir = Path("./snapshots") / f"backup_{timestamp}"
-    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    archive_path = Path("./snapshots") / f"backup_{timestamp}.tar.gz"
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
     
     try:
-        # Save vector store
+        # Save vector store and flush the SQLite WAL into rag.db
         await vector_store.save()
-        
-        # Copy files
-        shutil.copy2(settings.sqlite_path, snapshot_dir / "rag.db")
-        shutil.copy2(settings.index_dir / "faiss.index", snapshot_dir / "faiss.index")
-        shutil.copy2(settings.index_dir / "id_map.pkl", snapshot_dir / "id_map.pkl")
+        await document_store.checkpoint()
         
         # Create manifest
         manifest = {
@@ -42,31 +43,23 @@ async def create_backup(
             "stats": vector_store.get_stats(),
         }
         
-        import json
-        with open(snapshot_dir / "manifest.json", "w") as f:
-            json.dump(manifest, f, indent=2)
-        
-        # Create archive
-        archive_path = Path("./snapshots") / f"backup_{timestamp}.tar.gz"
-        shutil.make_archive(
-            str(archive_path.with_suffix("")),
-            "gztar",
-            snapshot_dir
+        # Archive files directly (pigz when available)
+        await async_targz(
+            _snapshot_files(),
+            archive_path,
+            extra_files={"manifest.json": dumps(manifest, indent=True)},
         )
         
-        # Clean up directory
-        shutil.rmtree(snapshot_dir)
-        
         return {
             "status": "success",
-            "snapshot": f"backup_{timestamp}.tar.gz",
+            "snapshot": archive_path.name,
             "path": str(archive_path)
         }
-        
+    
     except Exception as e:
         logger.error(f"Backup failed: {e}")
-        if snapshot_dir.exists():
-            shutil.rmtree(snapshot_dir)
+        if archive_path.exists():
+            archive_path.unlink()
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -74,6 +67,7 @@ async def create_backup(
 async def restore_backup(
     snapshot_name: str,
     vector_store = Depends(get_vector_store),
+    document_store = Depends(get_document_store),
 ):
     """Restore from a backup snapshot."""
     archive_path = Path("./snapshots") / snapshot_name
@@ -82,55 +76,105 @@ async def restore_backup(
         raise HTTPException(status_code=404, detail="Snapshot not found")
     
     temp_dir = Path("./var/restore_temp")
+    backup_dir = Path("./var/restore_backup")
     
     try:
         # Extract archive
-        shutil.unpack_archive(archive_path, temp_dir)
-        
-        # Backup current state
-        backup_dir = Path("./var/restore_backup")
-        backup_dir.mkdir(parents=True, exist_ok=True)
+        await async_untargz(archive_path, temp_dir)
         
-        if settings.sqlite_path.exists():
-            shutil.copy2(settings.sqlite_path, backup_dir / "rag.db.bak")
-        if (settings.index_dir / "faiss.index").exists():
-            shutil.copy2(settings.index_dir / "faiss.index", backup_dir / "faiss.index.bak")
-        if (settings.index_dir / "id_map.pkl").exists():
-            shutil.copy2(settings.index_dir / "id_map.pkl", backup_dir / "id_map.pkl.bak")
+        # Fold the WAL into rag.db, then close every pooled (mmapped) connection and
+        # drop the -wal/-shm files so nothing reads or replays over the copied file
+        await document_store.checkpoint()
+        await document_store.close()
+        _remove_sqlite_sidecars()
         
-        # Restore files
-        shutil.copy2(temp_dir / "rag.db", settings.sqlite_path)
-        shutil.copy2(temp_dir / "faiss.index", settings.index_dir / "faiss.index")
-        shutil.copy2(temp_dir / "id_map.pkl", settings.index_dir / "id_map.pkl")
+        # Backup current state and restore files
+        await _do_restore(temp_dir, backup_dir)
         
         # Reload vector store
         await vector_store.load()
         
         # Clean up
-        shutil.rmtree(temp_dir)
-        shutil.rmtree(backup_dir)
+        await asyncio.to_thread(_cleanup_dirs, temp_dir, backup_dir)
         
         return {
             "status": "success",
             "message": f"Restored from {snapshot_name}"
         }
-        
+    
     except Exception as e:
         logger.error(f"Restore failed: {e}")
         
         # Try to restore backup
-        if backup_dir.exists():
-            if (backup_dir / "rag.db.bak").exists():
-                shutil.copy2(backup_dir / "rag.db.bak", settings.sqlite_path)
-            if (backup_dir / "faiss.index.bak").exists():
-                shutil.copy2(backup_dir / "faiss.index.bak", settings.index_dir / "faiss.index")
-            if (backup_dir / "id_map.pkl.bak").exists():
-                shutil.copy2(backup_dir / "id_map.pkl.bak", settings.index_dir / "id_map.pkl")
-        
-        if temp_dir.exists():
-            shutil.rmtree(temp_dir)
+        await document_store.close()
+        _remove_sqlite_sidecars()
+        await _rollback_restore(backup_dir)
+        await asyncio.to_thread(_cleanup_dirs, temp_dir)
         
         raise HTTPException(status_code=500, detail=str(e))
+    
+    finally:
+        # Fresh engine over whichever database file is now in place
+        await document_store.initialize()
+
+
+def _snapshot_files() -> Dict[str, Path]:
+    """Map snapshot entry names to live data files."""
+    return {
+        "rag.db": settings.sqlite_path,
+        "faiss.index": settings.index_dir / "faiss.index",
+        "id_map.npz": settings.index_dir / "id_map.npz",
+    }
+
+
+def _remove_sqlite_sidecars() -> None:
+    """Delete the database's -wal and -shm files, which belong to the file being replaced."""
+    for suffix in ("-wal", "-shm"):
+        Path(f"{settings.sqlite_path}{suffix}").unlink(missing_ok=True)
+
+
+async def _copy_all(pairs: List[Tuple[Path, Path]]) -> None:
+    """Copy independent files concurrently in worker threads."""
+    await asyncio.gather(*(asyncio.to_thread(fast_copy, src, dst) for src, dst in pairs))
+
+
+async def _do_restore(temp_dir: Path, backup_dir: Path) -> None:
+    """Back up the current data files, then copy the extracted snapshot into place."""
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    files = _snapshot_files()
+    
+    await _copy_all([
+        (live_path, backup_dir / f"{name}.bak")
+        for name, live_path in files.items()
+        if live_path.exists()
+    ])
+    
+    legacy_id_map = temp_dir / "id_map.pkl"
+    if legacy_id_map.exists() and not (temp_dir / "id_map.npz").exists():
+        # Older snapshots pickle the ID map; the vector store still loads that format
+        files.pop("id_map.npz").unlink(missing_ok=True)
+        files["id_map.pkl"] = settings.index_dir / "id_map.pkl"
+    
+    await _copy_all([(temp_dir / name, live_path) for name, live_path in files.items()])
+
+
+async def _rollback_restore(backup_dir: Path) -> None:
+    """Put back data files saved by _do_restore."""
+    if not backup_dir.exists():
+        return
+    
+    await _copy_all([
+        (backup_dir / f"{name}.bak", live_path)
+        for name, live_path in _snapshot_files().items()
+        if (backup_dir / f"{name}.bak").exists()
+    ])
+
+
+def _cleanup_dirs(*dirs: Path) -> None:
+    """Remove temporary restore directories."""
+    for dir_path in dirs:
+        if dir_path.exists():
+            shutil.rmtree(dir_path)
 
 
 @router.post("/rebuild-index")
@@ -148,11 +192,8 @@ async def rebuild_index(
 
 
 @router.delete("/cache")
-async def clear_cache():
+async def clear_cache(cache = Depends(get_query_cache)):
     """Clear all caches."""
-    from app.storage.cache import QueryCache
-    
-    cache = QueryCache(settings.index_dir.parent, settings.cache_ttl)
     await cache.clear()
     
     return {"status": "success", "message": "Cache cleared"}
\ No newline at end of file
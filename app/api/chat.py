@@ -5,8 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from pydantic import BaseModel, Field
 import time
 
-from app.dependencies import get_retriever, get_generator, get_document_store
-from app.storage.cache import QueryCache
+from app.dependencies import get_retriever, get_generator, get_document_store, get_query_cache
 from app.config import settings
 from app.utils.logging import get_logger
 
@@ -34,6 +33,11 @@ class ChatResponse(BaseModel):
     processing_time: float
 
 
+def _normalize_query(query: str) -> str:
+    """Normalize case, whitespace and trailing punctuation for cache lookups."""
+    return " ".join(query.lower().split()).rstrip("?.! ")
+
+
 @router.post("/", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
@@ -41,17 +45,16 @@ async def chat(
     retriever = Depends(get_retriever),
     generator = Depends(get_generator),
     document_store = Depends(get_document_store),
+    cache = Depends(get_query_cache),
 ):
     """Process a chat query."""
     start_time = time.time()
-    
-    # Initialize cache
-    cache = QueryCache(settings.index_dir.parent, settings.cache_ttl)
+    cache_key = _normalize_query(request.query)
     
     # Check cache
     if request.use_cache:
         cached = await cache.get(
-            request.query,
+            cache_key,
             request.mode or ("offline" if settings.offline_mode else "llm"),
             request.top_k
         )
@@ -90,10 +93,10 @@ async def chat(
             ]
         )
         
-        # Cache result
-        if request.use_cache:
+        # Cache result (low-confidence answers are not worth reusing)
+        if request.use_cache and result.get("confidence", 0.0) >= settings.cache_min_confidence:
             await cache.set(
-                request.query,
+                cache_key,
                 result["mode"],
                 request.top_k,
                 {
@@ -1,5 +1,6 @@
 """Health check endpoints."""
 
+import time
 from fastapi import APIRouter, Depends
 from datetime import datetime
 
@@ -11,11 +12,25 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
+# (monotonic time, ISO string) of the last formatted timestamp
+_LAST_TS = (0.0, "")
+
+
+def _timestamp() -> str:
+    """Current UTC time as ISO string, reformatted at most once per second."""
+    global _LAST_TS
+    now = time.monotonic()
+    ts, value = _LAST_TS
+    if not value or now - ts > 1.0:
+        value = datetime.utcnow().isoformat()
+        _LAST_TS = (now, value)
+    return value
+
 
 @router.get("/healthz")
 async def health():
     """Basic health check."""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    return {"status": "healthy", "timestamp": _timestamp()}
 
 
 @router.get("/readiness")
@@ -45,12 +60,12 @@ async def readiness(
                 "mode": "offline" if settings.offline_mode else "llm",
                 "llm_provider": settings.active_llm_provider
             },
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _timestamp()
         }
     except Exception as e:
         logger.error(f"Readiness check failed: {e}")
         return {
             "status": "not_ready",
             "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _timestamp()
         }
\ No newline at end of file
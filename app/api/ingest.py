@@ -1,6 +1,7 @@
 """Ingestion API endpoints."""
 
 import os
+import secrets
 from pathlib import Path
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
@@ -8,12 +9,15 @@ from pydantic import BaseModel
 
 from app.dependencies import get_folder_watcher
 from app.ingest.pipeline import IngestionPipeline
+from app.utils.fastcopy import fast_move
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+
 
 class IngestResponse(BaseModel):
     """Ingestion response model."""
@@ -37,10 +41,10 @@ async def ingest_file(
     temp_path = temp_dir / file.filename
     
     try:
-        # Save file
+        # Save file in fixed-size chunks to bound memory use
         with open(temp_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                f.write(chunk)
         
         # Ingest file
         result = await watcher.pipeline.ingest_file(temp_path)
@@ -49,18 +53,14 @@ async def ingest_file(
             # Move to data directory
             data_dir = Path("./data/uploads")
             data_dir.mkdir(parents=True, exist_ok=True)
-            final_path = data_dir / file.filename
-            
-            # Handle duplicates
-            if final_path.exists():
-                base = final_path.stem
-                ext = final_path.suffix
-                counter = 1
-                while final_path.exists():
-                    final_path = data_dir / f"{base}_{counter}{ext}"
-                    counter += 1
+            final_path = _reserve_path(data_dir, file.filename)
             
-            temp_path.rename(final_path)
+            try:
+                fast_move(temp_path, final_path)
+            except BaseException:
+                # Don't leave the empty placeholder holding the name
+                final_path.unlink(missing_ok=True)
+                raise
             
             return IngestResponse(
                 status="success",
@@ -83,6 +83,19 @@ async def ingest_file(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _reserve_path(data_dir: Path, filename: str) -> Path:
+    """Atomically claim a free destination path, suffixing a random token on collision."""
+    candidate = data_dir / filename
+    while True:
+        try:
+            fd = os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            candidate = data_dir / f"{Path(filename).stem}_{secrets.token_hex(4)}{Path(filename).suffix}"
+            continue
+        os.close(fd)
+        return candidate
+
+
 @router.post("/directory")
 async def ingest_directory(
     path: str,
@@ -1,8 +1,11 @@
 """Search API endpoints."""
 
-from typing import Optional, List
-from fastapi import APIRouter, Depends, Query
-from pydantic import BaseModel
+import asyncio
+import hashlib
+import secrets
+from typing import Annotated, Optional, List
+from fastapi import APIRouter, Depends, Header, Query, Response
+from pydantic import BaseModel, Field
 
 from app.dependencies import get_retriever
 from app.utils.logging import get_logger
@@ -11,6 +14,9 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
+# Distinguishes ETags across restarts, since index versions restart at zero
+_INSTANCE_ID = secrets.token_hex(4)
+
 
 class SearchResult(BaseModel):
     """Search result model."""
@@ -30,21 +36,78 @@ class SearchResponse(BaseModel):
     total: int
 
 
+class BatchSearchRequest(BaseModel):
+    """Batch search request model."""
+    queries: List[Annotated[str, Field(min_length=1, max_length=500)]] = Field(
+        ..., min_length=1, max_length=256
+    )
+    top_k: int = Field(default=10, ge=1, le=50)
+
+
+class BatchSearchResponse(BaseModel):
+    """Batch search response model, one entry per query in request order."""
+    results: List[SearchResponse]
+
+
+def _search_etag(q: str, top_k: int, index_version: str) -> str:
+    """Build a weak ETag for a search over the current index version."""
+    digest = hashlib.blake2b(
+        f"{q}|{top_k}|{index_version}|{_INSTANCE_ID}".encode(),
+        digest_size=16,
+        usedforsecurity=False,
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
 @router.get("/", response_model=SearchResponse)
 async def search(
+    response: Response,
     q: str = Query(..., min_length=1, max_length=500),
     top_k: int = Query(default=10, ge=1, le=50),
+    if_none_match: Optional[str] = Header(default=None),
     retriever = Depends(get_retriever)
 ):
     """Search for relevant documents."""
+    etag = _search_etag(q, top_k, retriever.index_version)
+    
+    # Client already has this result
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    
     results = await retriever.search(
         query=q,
         top_k=top_k,
         use_reranker=False  # Fast search without reranking
     )
     
+    response.headers["ETag"] = etag
     return SearchResponse(
         query=q,
         results=[SearchResult(**r) for r in results],
         total=len(results)
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/batch", response_model=BatchSearchResponse)
+async def search_batch(
+    request: BatchSearchRequest,
+    retriever = Depends(get_retriever)
+):
+    """Search many queries at once.
+    
+    The searches run concurrently, so the vector store embeds the queries in one
+    batch and answers them with one FAISS search.
+    """
+    all_results = await asyncio.gather(*(
+        retriever.search(query=q, top_k=request.top_k, use_reranker=False)
+        for q in request.queries
+    ))
+    
+    return BatchSearchResponse(results=[
+        SearchResponse(
+            query=q,
+            results=[SearchResult(**r) for r in results],
+            total=len(results)
+        )
+        for q, results in zip(request.queries, all_results)
+    ])
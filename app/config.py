@@ -1,8 +1,9 @@
 """Configuration management for the RAG assistant."""
 
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import FrozenSet, List, Literal, Optional, Union
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field, field_validator, ConfigDict
 
@@ -43,6 +44,38 @@ class Settings(BaseSettings):
     max_context_tokens: int = Field(default=2000, ge=100, description="Maximum context tokens")
     chunk_size: int = Field(default=512, ge=100, description="Text chunk size")
     chunk_overlap: int = Field(default=50, ge=0, description="Chunk overlap size")
+    chunk_by_tokens: bool = Field(
+        default=False,
+        description="Measure chunk_size/chunk_overlap in embedding-model tokens instead of characters",
+    )
+    
+    # Vector Index
+    vector_index_type: Literal["flat", "hnsw", "ivf"] = Field(
+        default="flat",
+        description="FAISS index; hnsw/ivf trade a little recall for sub-linear search",
+    )
+    vector_precision: Literal["fp32", "fp16", "int8"] = Field(
+        default="fp32",
+        description="Stored vector precision; fp16/int8 cut index memory and bandwidth 2x/4x",
+    )
+    ivf_min_vectors: int = Field(
+        default=50_000,
+        ge=1_000,
+        description="Vectors kept in a flat index before IVF is trained on them",
+    )
+    
+    # Document Parsing
+    pdf_backend: Literal["auto", "pymupdf", "pypdf"] = Field(
+        default="auto",
+        description="PDF text extractor; auto uses PyMuPDF when installed, else pypdf/pdfminer",
+    )
+    csv_sample_rows: int = Field(
+        default=100_000, ge=20, description="Rows read from a CSV for its summary and sample"
+    )
+    ignore_dirs: str = Field(
+        default=".git,node_modules,__pycache__,.venv,venv",
+        description="Comma-separated directory names skipped when scanning for documents",
+    )
     
     # Server Configuration
     host: str = Field(default="127.0.0.1", description="Server host")
@@ -53,7 +86,26 @@ class Settings(BaseSettings):
     # Performance
     batch_size: int = Field(default=32, ge=1, description="Batch size for processing")
     max_workers: int = Field(default=4, ge=1, description="Maximum worker threads")
+    ingest_concurrency: int = Field(
+        default_factory=lambda: min(8, os.cpu_count() or 1),
+        ge=1,
+        description="Files ingested concurrently by ingest_directory",
+    )
     cache_ttl: int = Field(default=3600, ge=0, description="Cache TTL in seconds")
+    semantic_cache_size: int = Field(
+        default=1024, ge=0, description="Vector search results kept in memory (0 disables)"
+    )
+    semantic_cache_similarity: float = Field(
+        default=0.97, ge=0.0, le=1.0,
+        description="Query-embedding cosine similarity at which a cached search result is reused",
+    )
+    search_batch_window_ms: float = Field(
+        default=5.0, ge=0.0,
+        description="How long a vector search waits to be batched with concurrent searches",
+    )
+    cache_min_confidence: float = Field(
+        default=0.5, ge=0.0, le=1.0, description="Minimum answer confidence to cache"
+    )
     
     @field_validator("index_dir", "sqlite_path", "log_file", mode='before')
     @classmethod
@@ -61,7 +113,7 @@ class Settings(BaseSettings):
         """Ensure paths are Path objects and create parent directories."""
         if v:
             path = Path(v)
-            path.parent.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(path.parent)
             return path
         return v
     
@@ -72,12 +124,17 @@ class Settings(BaseSettings):
             return [Path(d.strip()) for d in self.watch_dirs.split(",") if d.strip()]
         return [Path(self.watch_dirs)]
     
-    @property
+    @cached_property
+    def parsed_ignore_dirs(self) -> FrozenSet[str]:
+        """Get ignored directory names as a set."""
+        return frozenset(d.strip() for d in self.ignore_dirs.split(",") if d.strip())
+    
+    @cached_property
     def has_llm_key(self) -> bool:
-        """Check if any LLM API key is configured."""
+        """Check if any LLM API key is configured (keys are fixed at startup)."""
         return bool(self.openai_api_key or self.mistral_api_key or self.anthropic_api_key)
     
-    @property
+    @cached_property
     def active_llm_provider(self) -> Optional[str]:
         """Get the active LLM provider based on available keys."""
         if self.openai_api_key:
@@ -91,14 +148,25 @@ class Settings(BaseSettings):
     def validate_paths(self) -> None:
         """Validate that all required paths exist or can be created."""
         for dir_path in [self.index_dir, self.sqlite_path.parent, self.log_file.parent]:
-            dir_path.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(dir_path)
         
         for watch_dir in self.parsed_watch_dirs:
-            watch_dir.mkdir(parents=True, exist_ok=True)
+            _ensure_dir(watch_dir)
 
 
-# Global settings instance
-settings = Settings()
+def _ensure_dir(path: Path) -> None:
+    """Create a directory unless it already exists (a stat is cheaper than mkdir)."""
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build and validate the process-wide settings once."""
+    settings = Settings()
+    settings.validate_paths()
+    return settings
 
-# Validate paths on import
-settings.validate_paths()
\ No newline at end of file
+
+# Global settings instance
+settings = get_settings()
\ No newline at end of file
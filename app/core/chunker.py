@@ -1,13 +1,20 @@
 """Text chunking strategies."""
 
 import re
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 from dataclasses import dataclass
+import numpy as np
 
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Control characters stripped from chunk text (keeps \t, \n, \r)
+_CONTROL_TABLE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), *range(0x7f, 0xa0)]
+)
+_WS_RE = re.compile(r'\s+')
+
 
 @dataclass
 class ChunkConfig:
@@ -17,16 +24,20 @@ class ChunkConfig:
     min_chunk_size: int = 100
     respect_sentence_boundary: bool = True
     respect_word_boundary: bool = True
+    # Measures sentence size against chunk_size/chunk_overlap (characters by default)
+    token_len: Callable[[str], int] = len
+    # Sizes every sentence of a text in one call; used instead of token_len when set
+    token_len_batch: Optional[Callable[[List[str]], List[int]]] = None
 
 
 class TextChunker:
     """Semantic-aware text chunker with overlap."""
     
+    # Sentence splitting pattern
+    sentence_pattern = re.compile(r'[.!?]\s+')
+    
     def __init__(self, config: Optional[ChunkConfig] = None):
         self.config = config or ChunkConfig()
-        
-        # Sentence splitting pattern
-        self.sentence_pattern = re.compile(r'[.!?]\s+')
     
     def chunk_text(
         self,
@@ -67,71 +78,61 @@ class TextChunker:
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
-        # Remove multiple spaces
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep punctuation
-        text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
-        
-        return text.strip()
+        # Collapse whitespace, then drop control characters
+        return _WS_RE.sub(' ', text).translate(_CONTROL_TABLE).strip()
     
     def _chunk_by_sentences(self, text: str) -> List[Dict[str, Any]]:
         """Chunk text by sentences with overlap."""
-        sentences = self.sentence_pattern.split(text)
+        sentences = [s for s in (s.strip() for s in self.sentence_pattern.split(text)) if s]
+        if not sentences:
+            return []
+        
+        # Cumulative sentence sizes: cum[j] - cum[i] is the size of sentences[i:j]
+        n = len(sentences)
+        if self.config.token_len_batch is not None:
+            lens = np.asarray(self.config.token_len_batch(sentences), dtype=np.int64)
+        else:
+            lens = np.fromiter(map(self.config.token_len, sentences), dtype=np.int64, count=n)
+        cum = np.concatenate(([0], lens.cumsum()))
+        
+        # Character offsets are tracked separately when sizes are not in characters
+        if self.config.token_len is len and self.config.token_len_batch is None:
+            char_cum = cum
+        else:
+            char_lens = np.fromiter(map(len, sentences), dtype=np.int64, count=n)
+            char_cum = np.concatenate(([0], char_lens.cumsum()))
         
         chunks = []
-        current_chunk = []
-        current_size = 0
+        start_idx = 0
+        min_end = 1
         start_pos = 0
         
-        for i, sentence in enumerate(sentences):
-            sentence = sentence.strip()
-            if not sentence:
-                continue
+        while True:
+            # Take as many sentences as fit, but always make progress
+            end_idx = int(np.searchsorted(cum, cum[start_idx] + self.config.chunk_size, side='right')) - 1
+            end_idx = min(max(end_idx, min_end), n)
             
-            sentence_size = len(sentence)
-            
-            # Check if adding this sentence exceeds chunk size
-            if current_size + sentence_size > self.config.chunk_size and current_chunk:
-                # Create chunk
-                chunk_text = ' '.join(current_chunk)
-                chunks.append({
-                    "text": chunk_text,
-                    "start": start_pos,
-                    "end": start_pos + len(chunk_text)
-                })
-                
-                # Handle overlap
-                if self.config.chunk_overlap > 0:
-                    # Keep last few sentences for overlap
-                    overlap_size = 0
-                    overlap_sentences = []
-                    
-                    for sent in reversed(current_chunk):
-                        overlap_size += len(sent)
-                        overlap_sentences.insert(0, sent)
-                        if overlap_size >= self.config.chunk_overlap:
-                            break
-                    
-                    current_chunk = overlap_sentences
-                    current_size = sum(len(s) for s in current_chunk)
-                    start_pos = start_pos + len(chunk_text) - current_size
-                else:
-                    current_chunk = []
-                    current_size = 0
-                    start_pos = start_pos + len(chunk_text) + 1
-            
-            current_chunk.append(sentence)
-            current_size += sentence_size
-        
-        # Add final chunk
-        if current_chunk:
-            chunk_text = ' '.join(current_chunk)
+            chunk_text = ' '.join(sentences[start_idx:end_idx])
             chunks.append({
                 "text": chunk_text,
                 "start": start_pos,
                 "end": start_pos + len(chunk_text)
             })
+            
+            if end_idx >= n:
+                break
+            
+            # Handle overlap: shortest run of trailing sentences covering chunk_overlap
+            if self.config.chunk_overlap > 0:
+                overlap_idx = int(np.searchsorted(cum, cum[end_idx] - self.config.chunk_overlap, side='right')) - 1
+                overlap_idx = min(max(overlap_idx, start_idx), end_idx - 1)
+                start_pos = start_pos + len(chunk_text) - int(char_cum[end_idx] - char_cum[overlap_idx])
+                start_idx = overlap_idx
+            else:
+                start_pos = start_pos + len(chunk_text) + 1
+                start_idx = end_idx
+            
+            min_end = end_idx + 1
         
         return chunks
     
@@ -166,8 +167,8 @@ class TextChunker:
             if end >= text_len:
                 break
             
-            start = end - self.config.chunk_overlap
-            if start <= chunks[-1]["start"] if chunks else 0:
-                start = end
+            # Guarantee forward progress when overlap >= window length
+            next_start = end - self.config.chunk_overlap
+            start = next_start if next_start > start else end
         
         return chunks
\ No newline at end of file
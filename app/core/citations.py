@@ -8,26 +8,22 @@ from app.utils.logging import get_logger
 logger = get_logger(__name__)
 
 class CitationExtractor:
-    def __init__(self):
-        # Pattern to find citation markers like [1], [2], etc.
-        self.citation_pattern = re.compile(r'\[(\d+)\]')
-
-    def extract(self, text: str):
-        return self.citation_pattern.findall(text)
-
-
-
+    """Extract and format citations from generated answers."""
+    
+    # Pattern to find citation markers like [1], [2], etc.
+    citation_pattern = re.compile(r'\[(\d+)\]')
     
     def extract(self, answer: str, contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Extract citations from answer text."""
         citations = []
-        markers = self.citation_pattern.findall(answer)
+        # Distinct markers in first-seen order, so repeated [n] are handled once
+        markers = dict.fromkeys(self.citation_pattern.findall(answer))
         
         for marker in markers:
             idx = int(marker) - 1
             if 0 <= idx < len(contexts):
                 context = contexts[idx]
-                citation = {
+                citations.append({
                     "index": int(marker),
                     "chunk_id": context.get("chunk_id"),
                     "document_id": context.get("document_id"),
@@ -35,9 +31,7 @@ class CitationExtractor:
                     "filename": context.get("filename"),
                     "page_number": context.get("page_number"),
                     "text_snippet": self._create_snippet(context.get("text", "")),
-                }
-                if citation not in citations:
-                    citations.append(citation)
+                })
         
         if not citations and contexts:
             for i, context in enumerate(contexts[:3], 1):
@@ -1,36 +1,101 @@
 """Document and chunk deduplication."""
 
 import hashlib
+import inspect
+import struct
 from typing import List, Dict, Any, Optional, Tuple, Set
 
-from datasketch import MinHash, MinHashLSH
+from datasketch import LeanMinHash, MinHashLSH
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+from sklearn.feature_extraction.text import HashingVectorizer
 
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+NUM_PERM = 128
+MINHASH_SEED = 1
+
+# Same universal-hashing constants as datasketch's MinHash
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# datasketch >= 2.0 requires naming the scheme of precomputed hash values
+_LEAN_KWARGS = (
+    {"scheme": "legacy"}
+    if "scheme" in inspect.signature(LeanMinHash.__init__).parameters
+    else {}
+)
+
+try:
+    import xxhash
+    
+    def _hash32(token: str) -> int:
+        return xxhash.xxh32_intdigest(token)
+    
+    def _text_key(text: str) -> int:
+        return xxhash.xxh3_128_intdigest(text)
+except ImportError:
+    def _hash32(token: str) -> int:
+        # datasketch's default sha1_hash32
+        return struct.unpack('<I', hashlib.sha1(token.encode('utf8'), usedforsecurity=False).digest()[:4])[0]
+    
+    def _text_key(text: str) -> int:
+        return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=16, usedforsecurity=False).digest(), 'little')
+
+
+def _band_key(band: bytes) -> bytes:
+    """Pack an LSH band (rows x 8 bytes) into an 8-byte bucket key."""
+    return hashlib.blake2b(band, digest_size=8, usedforsecurity=False).digest()
+
+
+def _init_permutations(num_perm: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Draw permutation parameters exactly like datasketch.MinHash(seed=seed)."""
+    gen = np.random.RandomState(seed)
+    a, b = np.array(
+        [
+            (gen.randint(1, _MERSENNE_PRIME, dtype=np.uint64),
+             gen.randint(0, _MERSENNE_PRIME, dtype=np.uint64))
+            for _ in range(num_perm)
+        ],
+        dtype=np.uint64
+    ).T
+    return a, b
+
 
 class Deduplicator:
     """Handle document and chunk deduplication."""
     
-    def __init__(self, threshold: float = 0.85):
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        storage_config: Optional[Dict[str, Any]] = None
+    ):
         self.threshold = threshold
-        self.lsh = MinHashLSH(threshold=threshold, num_perm=128)
+        # storage_config lets a large index live in Redis/Cassandra instead of memory
+        self.lsh = MinHashLSH(
+            threshold=threshold,
+            num_perm=NUM_PERM,
+            storage_config=storage_config,
+            hashfunc=_band_key
+        )
         self.seen_hashes = set()
-        self.tfidf_vectorizer = TfidfVectorizer(
-            max_features=1000,
+        self._perm_a, self._perm_b = _init_permutations(NUM_PERM, MINHASH_SEED)
+        self._lsh_count = 0
+        # Stateless, so nothing is refit per call; rows come out L2-normalised
+        self.vectorizer = HashingVectorizer(
+            n_features=2**18,
+            alternate_sign=False,
             stop_words='english',
-            ngram_range=(1, 2)
+            ngram_range=(1, 2),
+            norm='l2'
         )
-        self.tfidf_matrix = None
-        self.document_texts = []
     
     def is_duplicate_exact(self, text: str) -> bool:
-        """Check for exact duplicate using hash."""
-        text_hash = hashlib.sha256(text.encode()).hexdigest()
+        """Check for exact duplicate using a 128-bit non-cryptographic hash."""
+        text_hash = _text_key(text)
         
         if text_hash in self.seen_hashes:
             return True
@@ -38,12 +103,24 @@ class Deduplicator:
         self.seen_hashes.add(text_hash)
         return False
     
+    def _minhash(self, text: str) -> LeanMinHash:
+        """Build a MinHash signature for the text's tokens in one NumPy pass."""
+        tokens = set(text.lower().split())
+        if not tokens:
+            hashvalues = np.full(NUM_PERM, _MAX_HASH, dtype=np.uint64)
+        else:
+            hv = np.fromiter((_hash32(t) for t in tokens), dtype=np.uint64, count=len(tokens))
+            perm = np.bitwise_and(
+                (self._perm_a[:, None] * hv[None, :] + self._perm_b[:, None]) % _MERSENNE_PRIME,
+                _MAX_HASH
+            )
+            hashvalues = perm.min(axis=1)
+        
+        return LeanMinHash(seed=MINHASH_SEED, hashvalues=hashvalues, **_LEAN_KWARGS)
+    
     def is_duplicate_fuzzy(self, text: str) -> Tuple[bool, float]:
         """Check for near-duplicate using MinHash."""
-        # Create MinHash for the text
-        minhash = MinHash(num_perm=128)
-        for word in text.lower().split():
-            minhash.update(word.encode('utf8'))
+        minhash = self._minhash(text)
         
         # Query LSH for similar documents
         result = self.lsh.query(minhash)
@@ -52,7 +129,8 @@ class Deduplicator:
             return True, self.threshold
         
         # Add to LSH
-        doc_id = f"doc_{len(self.seen_hashes)}"
+        doc_id = f"doc_{self._lsh_count}"
+        self._lsh_count += 1
         self.lsh.insert(doc_id, minhash)
         
         return False, 0.0
@@ -62,37 +140,36 @@ class Deduplicator:
         chunks: List[str],
         similarity_threshold: float = 0.9
     ) -> List[List[int]]:
-        """Find similar chunks within a list using TF-IDF."""
+        """Find similar chunks within a list using hashed term vectors."""
         if len(chunks) < 2:
             return []
         
         # Vectorize chunks
         try:
-            tfidf_matrix = self.tfidf_vectorizer.fit_transform(chunks)
+            term_matrix = self.vectorizer.transform(chunks)
         except:
             # If vectorization fails, return no duplicates
             return []
         
-        # Calculate cosine similarity
-        similarity_matrix = cosine_similarity(tfidf_matrix)
-        
-        # Find similar pairs
-        similar_groups = []
-        processed = set()
-        
-        for i in range(len(chunks)):
-            if i in processed:
-                continue
-            
-            group = [i]
-            for j in range(i + 1, len(chunks)):
-                if similarity_matrix[i, j] >= similarity_threshold:
-                    group.append(j)
-                    processed.add(j)
-            
-            if len(group) > 1:
-                similar_groups.append(group)
-                processed.add(i)
+        # Rows are L2-normalised, so the sparse product is cosine similarity
+        similarity = sparse.triu(term_matrix @ term_matrix.T, k=1).tocsr()
+        similarity.data[similarity.data < similarity_threshold] = 0
+        similarity.eliminate_zeros()
+        
+        if similarity.nnz == 0:
+            return []
+        
+        # Group chunks linked by any above-threshold pair
+        _, labels = connected_components(similarity, directed=False)
+        order = np.argsort(labels, kind='stable')
+        _, starts, counts = np.unique(labels[order], return_index=True, return_counts=True)
+        
+        similar_groups = [
+            order[start:start + count].tolist()
+            for start, count in zip(starts, counts)
+            if count > 1
+        ]
+        similar_groups.sort(key=lambda group: group[0])
         
         return similar_groups
     
@@ -23,6 +23,9 @@ class EmbeddingModel:
         """Load the embedding model."""
         logger.info(f"Loading embedding model: {self.model_name}")
         self.model = SentenceTransformer(self.model_name, device=self.device)
+        if self.device == "cuda":
+            # Half precision halves activation bandwidth and uses tensor cores
+            self.model = self.model.half()
         
         # Get embedding dimension
         test_embedding = self.model.encode("test", convert_to_numpy=True)
@@ -30,6 +33,20 @@ class EmbeddingModel:
         
         logger.info(f"Embedding model loaded (dimension: {self.dimension}, device: {self.device})")
     
+    def token_length(self, text: str) -> int:
+        """Count model tokens in text, excluding special tokens."""
+        if not self.model:
+            raise RuntimeError("Embedding model not initialized")
+        return len(self.model.tokenizer(text, add_special_tokens=False)["input_ids"])
+    
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """Count model tokens in many texts with one batched (parallel, native) tokenizer call."""
+        if not self.model:
+            raise RuntimeError("Embedding model not initialized")
+        if not texts:
+            return []
+        return [len(ids) for ids in self.model.tokenizer(texts, add_special_tokens=False)["input_ids"]]
+    
     async def embed(self, text: str) -> np.ndarray:
         """Generate embedding for a single text."""
         if not self.model:
@@ -47,16 +64,17 @@ class EmbeddingModel:
         self,
         texts: List[str],
         batch_size: int = 32
-    ) -> List[np.ndarray]:
-        """Generate embeddings for multiple texts."""
+    ) -> np.ndarray:
+        """Generate embeddings for multiple texts as a float32 (n, dim) array."""
         if not self.model:
             await self.initialize()
         
+        # Keep batches on the device and copy back to host once
         embeddings = self.model.encode(
             texts,
             batch_size=batch_size,
-            convert_to_numpy=True,
+            convert_to_tensor=True,
             normalize_embeddings=True,
             show_progress_bar=len(texts) > 100
         )
-        return embeddings.tolist()
\ No newline at end of file
+        return embeddings.float().cpu().numpy()
\ No newline at end of file
@@ -1,16 +1,24 @@
 """Answer generation with offline and LLM modes."""
 
+import heapq
+import re
 from typing import List, Dict, Any, Optional
-import openai
 import httpx
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
 
 from app.core.citations import CitationExtractor
-from app.utils.tokens import count_tokens, truncate_to_tokens
+from app.utils.http import make_async_client
+from app.utils.tokens import count_tokens_batch, truncate_to_tokens
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Word tokens for offline overlap scoring; punctuation no longer hides a match
+_TOKEN_RE = re.compile(r"[\w']+")
+# Sentence boundary: a period followed by any whitespace, not just a space
+_SENTENCE_SPLIT_RE = re.compile(r"\.\s+")
+
 
 class AnswerGenerator:
     """Generate answers from retrieved context."""
@@ -35,21 +43,31 @@ class AnswerGenerator:
         
         if not offline_mode and api_key:
             if provider == "openai":
-                openai.api_key = api_key
-                self.openai_client = openai
+                self.openai_client = AsyncOpenAI(api_key=api_key)
             elif provider == "anthropic":
-                self.anthropic_client = Anthropic(api_key=api_key)
+                self.anthropic_client = AsyncAnthropic(api_key=api_key)
             elif provider == "mistral":
-                # Mistral uses HTTP client
-                self.mistral_client = httpx.AsyncClient(
+                # Mistral uses HTTP client; one pooled client shares connections across calls
+                self.mistral_client = make_async_client(
                     base_url="https://api.mistral.ai/v1",
-                    headers={"Authorization": f"Bearer {api_key}"}
+                    headers={"Authorization": f"Bearer {api_key}"},
+                    timeout=httpx.Timeout(60.0, connect=5.0),
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
                 )
     
     async def initialize(self):
         """Initialize generator."""
         logger.info(f"Answer generator initialized (mode: {'offline' if self.offline_mode else self.provider})")
     
+    async def close(self):
+        """Close API clients and their connection pools."""
+        if self.mistral_client:
+            await self.mistral_client.aclose()
+        if self.openai_client:
+            await self.openai_client.close()
+        if self.anthropic_client:
+            await self.anthropic_client.close()
+    
     async def generate(
         self,
         query: str,
@@ -87,15 +105,17 @@ class AnswerGenerator:
     
     def _prepare_context(self, contexts: List[Dict[str, Any]]) -> str:
         """Prepare context text from retrieved chunks."""
+        # Format context with source info
+        parts = [
+            f"[{i}] From '{ctx['filename']}':\n{ctx['text']}\n"
+            for i, ctx in enumerate(contexts, 1)
+        ]
+        
         context_parts = []
         total_tokens = 0
         
-        for i, ctx in enumerate(contexts, 1):
-            # Format context with source info
-            context_part = f"[{i}] From '{ctx['filename']}':\n{ctx['text']}\n"
-            
-            # Check token limit
-            part_tokens = count_tokens(context_part)
+        # Check token limit with a running sum over one batched encode
+        for context_part, part_tokens in zip(parts, count_tokens_batch(parts)):
             if total_tokens + part_tokens > self.max_context_tokens:
                 break
             
@@ -113,25 +133,24 @@ class AnswerGenerator:
         """Generate answer in offline mode using extractive summarization."""
         # Simple extractive approach: find most relevant sentences
         sentences = []
+        query_terms = frozenset(_TOKEN_RE.findall(query.lower()))
         
         for ctx in contexts[:3]:  # Use top 3 contexts
             text = ctx["text"]
             # Split into sentences
-            text_sentences = text.split(". ")
+            text_sentences = _SENTENCE_SPLIT_RE.split(text)
             
             # Score sentences based on query terms
-            query_terms = set(query.lower().split())
             scored_sentences = []
             
             for sent in text_sentences:
-                sent_terms = set(sent.lower().split())
-                overlap = len(query_terms & sent_terms)
+                overlap = len(query_terms.intersection(_TOKEN_RE.findall(sent.lower())))
                 if overlap > 0:
                     scored_sentences.append((sent, overlap))
             
-            # Add top sentences
-            scored_sentences.sort(key=lambda x: x[1], reverse=True)
-            sentences.extend([s[0] for s in scored_sentences[:2]])
+            # Add top sentences (nlargest is stable, like sort(reverse=True))
+            top = heapq.nlargest(2, scored_sentences, key=lambda x: x[1])
+            sentences.extend([s[0] for s in top])
         
         if not sentences:
             return "Based on the available documents, I cannot provide a specific answer to your question."
@@ -179,7 +198,7 @@ Answer:"""
     
     async def _call_openai(self, prompt: str) -> str:
         """Call OpenAI API."""
-        response = openai.ChatCompletion.create(
+        response = await self.openai_client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant."},
@@ -192,7 +211,7 @@ Answer:"""
     
     async def _call_anthropic(self, prompt: str) -> str:
         """Call Anthropic API."""
-        response = self.anthropic_client.messages.create(
+        response = await self.anthropic_client.messages.create(
             model="claude-3-haiku-20240307",
             max_tokens=500,
             temperature=0.3,
@@ -1,5 +1,6 @@
 """Language detection utilities."""
 
+from collections import OrderedDict
 from typing import Optional
 import langdetect
 from langdetect import detect_langs, LangDetectException
@@ -11,12 +12,17 @@ logger = get_logger(__name__)
 # Configure langdetect for consistency
 langdetect.DetectorFactory.seed = 42
 
+# A text's language is settled by its opening, so cache on a prefix fingerprint
+FINGERPRINT_CHARS = 512
+
 
 class LanguageDetector:
     """Detect language of text content."""
     
-    def __init__(self, min_confidence: float = 0.7):
+    def __init__(self, min_confidence: float = 0.7, cache_size: int = 4096):
         self.min_confidence = min_confidence
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, Optional[str]]" = OrderedDict()
         self.supported_languages = {
             'en', 'es', 'fr', 'de', 'it', 'pt', 'nl', 'ru', 'zh', 'ja', 'ko'
         }
@@ -26,6 +32,19 @@ class LanguageDetector:
         if not text or len(text.strip()) < 20:
             return None
         
+        key = hash(text[:FINGERPRINT_CHARS])
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        
+        lang = self._detect_uncached(text)
+        self._cache[key] = lang
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return lang
+    
+    def _detect_uncached(self, text: str) -> Optional[str]:
+        """Run langdetect on the full text."""
         try:
             # Get language probabilities
             langs = detect_langs(text)
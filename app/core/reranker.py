@@ -1,6 +1,8 @@
 """Cross-encoder reranking for improved relevance."""
 
-from typing import List, Tuple
+from itertools import repeat
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
 import torch
 from sentence_transformers import CrossEncoder
 
@@ -8,6 +10,45 @@ from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# On GPU a typical candidate set fits one forward pass; cap it to bound memory
+GPU_MAX_BATCH = 128
+
+
+def load_cross_encoder(model_name: str, device: Optional[str] = None) -> CrossEncoder:
+    """Load a cross-encoder, in half precision when running on CUDA."""
+    device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+    model = CrossEncoder(model_name, device=device)
+    if device == "cuda":
+        model.model.half()
+    return model
+
+
+def predict_by_length(
+    model: CrossEncoder,
+    pairs: Sequence[Sequence[str]],
+    batch_size: Optional[int] = None
+) -> np.ndarray:
+    """Score pairs in length-sorted order so each mini-batch pads to similar lengths.
+    
+    Scores are returned in the original pair order. Without an explicit
+    batch_size, GPU runs score up to GPU_MAX_BATCH pairs per forward pass.
+    """
+    if batch_size is None:
+        batch_size = min(len(pairs), GPU_MAX_BATCH) if torch.cuda.is_available() else 32
+    
+    order = np.argsort([len(passage) for _, passage in pairs], kind="stable")
+    with torch.inference_mode():
+        sorted_scores = model.predict(
+            [pairs[i] for i in order],
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+    
+    scores = np.empty_like(sorted_scores)
+    scores[order] = sorted_scores
+    return scores
+
 
 class Reranker:
     """Cross-encoder based reranker."""
@@ -20,7 +61,7 @@ class Reranker:
     def initialize(self):
         """Load the reranking model."""
         logger.info(f"Loading reranker: {self.model_name}")
-        self.model = CrossEncoder(self.model_name, device=self.device)
+        self.model = load_cross_encoder(self.model_name, self.device)
     
     def rerank(
         self,
@@ -36,10 +77,10 @@ class Reranker:
             return []
         
         # Create query-passage pairs
-        pairs = [[query, passage] for passage in passages]
+        pairs = list(zip(repeat(query), passages))
         
         # Get scores
-        scores = self.model.predict(pairs, show_progress_bar=False)
+        scores = predict_by_length(self.model, pairs)
         
         # Sort by score
         scored_indices = [(i, float(score)) for i, score in enumerate(scores)]
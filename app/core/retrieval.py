@@ -1,10 +1,12 @@
 """Hybrid retrieval combining vector search and BM25."""
 
+import asyncio
+from itertools import repeat
 from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 from rank_bm25 import BM25Okapi
-from sentence_transformers import CrossEncoder
 
+from app.core.reranker import load_cross_encoder, predict_by_length
 from app.storage.vector_store import VectorStore
 from app.storage.document_store import DocumentStore
 from app.utils.logging import get_logger
@@ -31,14 +33,20 @@ class HybridRetriever:
         self.bm25_weight = bm25_weight
         self.bm25_index = None
         self.chunk_texts = []
-        self.chunk_ids = []
+        self.chunk_ids = np.empty(0, dtype=object)
+        self.bm25_version = 0
+    
+    @property
+    def index_version(self) -> str:
+        """Token that changes whenever the BM25 or vector index changes."""
+        return f"{self.bm25_version}.{getattr(self.vector_store, 'version', 0)}"
     
     async def initialize(self):
         """Initialize retriever components."""
         # Load reranker if specified
         if self.reranker_model_name:
             logger.info(f"Loading reranker: {self.reranker_model_name}")
-            self.reranker = CrossEncoder(self.reranker_model_name)
+            self.reranker = load_cross_encoder(self.reranker_model_name)
         
         # Build BM25 index
         await self.rebuild_bm25_index()
@@ -47,26 +55,28 @@ class HybridRetriever:
         """Rebuild BM25 index from all chunks."""
         logger.info("Building BM25 index...")
         
-        # Get all documents
-        documents = await self.document_store.list_documents(limit=10000)
-        
-        self.chunk_texts = []
-        self.chunk_ids = []
+        chunk_texts = []
+        chunk_ids = []
         
-        for doc in documents:
-            chunks = await self.document_store.get_chunks(doc.id)
-            for chunk in chunks:
-                self.chunk_texts.append(chunk.text)
-                self.chunk_ids.append(chunk.embedding_id)
+        # One streamed query instead of a get_chunks round trip per document
+        async for text, embedding_id in self.document_store.stream_chunks():
+            chunk_texts.append(text)
+            chunk_ids.append(embedding_id)
         
-        if self.chunk_texts:
+        if chunk_texts:
             # Tokenize for BM25
-            tokenized_corpus = [text.lower().split() for text in self.chunk_texts]
-            self.bm25_index = BM25Okapi(tokenized_corpus)
-            logger.info(f"BM25 index built with {len(self.chunk_texts)} chunks")
+            tokenized_corpus = [text.lower().split() for text in chunk_texts]
+            bm25_index = BM25Okapi(tokenized_corpus)
+            logger.info(f"BM25 index built with {len(chunk_texts)} chunks")
         else:
-            self.bm25_index = None
+            bm25_index = None
             logger.warning("No chunks available for BM25 index")
+        
+        # Swap in together so searches never pair an index with the wrong ids
+        self.chunk_texts = chunk_texts
+        self.chunk_ids = np.asarray(chunk_ids, dtype=object)
+        self.bm25_index = bm25_index
+        self.bm25_version += 1
     
     async def search(
         self,
@@ -78,61 +88,35 @@ class HybridRetriever:
         """Perform hybrid search."""
         results = []
         
-        # Vector search
-        vector_results = await self.vector_store.search(query, top_k=top_k*2)
-        
-        # BM25 search
-        bm25_results = []
-        if self.bm25_index and self.chunk_texts:
-            tokenized_query = query.lower().split()
-            bm25_scores = self.bm25_index.get_scores(tokenized_query)
-            
-            # Get top-k BM25 results
-            top_indices = np.argsort(bm25_scores)[-top_k*2:][::-1]
-            for idx in top_indices:
-                if idx < len(self.chunk_ids):
-                    bm25_results.append((
-                        self.chunk_ids[idx],
-                        float(bm25_scores[idx]),
-                        {}
-                    ))
+        # Vector search and BM25 scoring run concurrently
+        vector_results, bm25_results = await asyncio.gather(
+            self.vector_store.search(query, top_k=top_k*2),
+            asyncio.to_thread(self._bm25_search, query, top_k*2),
+        )
         
         # Combine results
-        combined_scores = {}
-        all_ids = set()
-        
-        # Add vector search results
-        for embedding_id, score, metadata in vector_results:
-            combined_scores[embedding_id] = self.vector_weight * score
-            all_ids.add(embedding_id)
-        
-        # Add BM25 results
-        for embedding_id, score, _ in bm25_results:
-            if embedding_id in combined_scores:
-                combined_scores[embedding_id] += self.bm25_weight * min(score, 1.0)
-            else:
-                combined_scores[embedding_id] = self.bm25_weight * min(score, 1.0)
-            all_ids.add(embedding_id)
-        
-        # Sort by combined score
-        sorted_ids = sorted(combined_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        # Get chunk details
-        for embedding_id, score in sorted_ids[:top_k*2]:
-            chunk = await self.document_store.get_chunk_by_embedding_id(embedding_id)
-            if chunk:
-                doc = await self.document_store.get_document_by_id(chunk.document_id)
-                if doc:
-                    results.append({
-                        "chunk_id": chunk.id,
-                        "document_id": doc.id,
-                        "text": chunk.text,
-                        "score": score,
-                        "file_path": doc.file_path,
-                        "filename": doc.filename,
-                        "page_number": chunk.page_number,
-                        "chunk_index": chunk.chunk_index,
-                    })
+        sorted_ids = self._fuse_scores(vector_results, bm25_results)
+        
+        # Get chunk details in one batched lookup
+        top_ids = sorted_ids[:top_k*2]
+        rows = {}
+        if top_ids:
+            rows = await self.document_store.get_chunks_with_docs([eid for eid, _ in top_ids])
+        
+        for embedding_id, score in top_ids:
+            row = rows.get(embedding_id)
+            if row:
+                chunk, doc = row
+                results.append({
+                    "chunk_id": chunk.id,
+                    "document_id": doc.id,
+                    "text": chunk.text,
+                    "score": score,
+                    "file_path": doc.file_path,
+                    "filename": doc.filename,
+                    "page_number": chunk.page_number,
+                    "chunk_index": chunk.chunk_index,
+                })
         
         # Rerank if enabled
         if use_reranker and self.reranker and results:
@@ -142,6 +126,54 @@ class HybridRetriever:
         
         return results
     
+    def _fuse_scores(
+        self,
+        vector_results: List[Tuple[str, float, Dict[str, Any]]],
+        bm25_results: List[Tuple[str, float, Dict[str, Any]]],
+    ) -> List[Tuple[str, float]]:
+        """Merge weighted vector and BM25 scores per id, best first.
+        
+        Ties keep first-seen order (vector results before BM25 results).
+        """
+        n_vec = len(vector_results)
+        if n_vec + len(bm25_results) == 0:
+            return []
+        
+        ids = np.array([r[0] for r in vector_results] + [r[0] for r in bm25_results], dtype=object)
+        weighted = np.concatenate([
+            self.vector_weight * np.array([r[1] for r in vector_results], dtype=np.float64),
+            self.bm25_weight * np.minimum(np.array([r[1] for r in bm25_results], dtype=np.float64), 1.0),
+        ])
+        
+        unique_ids, first_seen, inverse = np.unique(ids, return_index=True, return_inverse=True)
+        combined = np.zeros(len(unique_ids))
+        np.add.at(combined, inverse, weighted)
+        
+        order = np.lexsort((first_seen, -combined))
+        return list(zip(unique_ids[order].tolist(), combined[order].tolist()))
+    
+    def _bm25_search(self, query: str, k: int) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """Score the query against the BM25 index and return the top k chunks."""
+        # Snapshot references so a concurrent rebuild can't swap them mid-search
+        bm25_index, chunk_ids = self.bm25_index, self.chunk_ids
+        if not bm25_index or len(chunk_ids) == 0:
+            return []
+        
+        tokenized_query = query.lower().split()
+        bm25_scores = bm25_index.get_scores(tokenized_query)
+        
+        # Partial selection, then sort only the slice
+        k = min(k, len(bm25_scores))
+        part = np.argpartition(bm25_scores, -k)[-k:]
+        top_indices = part[np.argsort(-bm25_scores[part], kind='stable')]
+        top_indices = top_indices[top_indices < len(chunk_ids)]
+        
+        return list(zip(
+            chunk_ids[top_indices].tolist(),
+            bm25_scores[top_indices].tolist(),
+            repeat({}),
+        ))
+    
     async def rerank(
         self,
         query: str,
@@ -153,10 +185,10 @@ class HybridRetriever:
             return results[:top_k]
         
         # Prepare pairs for reranking
-        pairs = [[query, result["text"]] for result in results]
+        pairs = [(query, result["text"]) for result in results]
         
         # Get reranking scores
-        rerank_scores = self.reranker.predict(pairs)
+        rerank_scores = predict_by_length(self.reranker, pairs)
         
         # Update scores and sort
         for i, result in enumerate(results):
@@ -1,5 +1,6 @@
 """Dependency injection for FastAPI."""
 
+import asyncio
 from typing import AsyncGenerator, Optional
 from contextlib import asynccontextmanager
 from fastapi import Depends, HTTPException, status
@@ -12,6 +13,8 @@ from app.core.embeddings import EmbeddingModel
 from app.core.retrieval import HybridRetriever
 from app.core.generator import AnswerGenerator
 from app.ingest.watcher import FolderWatcher
+from app.ingest.parsers.pdf import shutdown_executor
+from app.storage.cache import QueryCache
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -23,14 +26,27 @@ _embedding_model: Optional[EmbeddingModel] = None
 _retriever: Optional[HybridRetriever] = None
 _generator: Optional[AnswerGenerator] = None
 _folder_watcher: Optional[FolderWatcher] = None
+_query_cache: Optional[QueryCache] = None
+
+# Per-singleton init locks. Instances are published only once initialized, and
+# lifespan precreates them all, so after startup getters never touch a lock.
+_document_store_lock = asyncio.Lock()
+_vector_store_lock = asyncio.Lock()
+_embedding_model_lock = asyncio.Lock()
+_retriever_lock = asyncio.Lock()
+_generator_lock = asyncio.Lock()
+_folder_watcher_lock = asyncio.Lock()
 
 
 async def get_document_store() -> DocumentStore:
     """Get or create document store instance."""
     global _document_store
     if _document_store is None:
-        _document_store = DocumentStore(settings.sqlite_path)
-        await _document_store.initialize()
+        async with _document_store_lock:
+            if _document_store is None:
+                document_store = DocumentStore(settings.sqlite_path)
+                await document_store.initialize()
+                _document_store = document_store
     return _document_store
 
 
@@ -38,12 +54,15 @@ async def get_vector_store() -> VectorStore:
     """Get or create vector store instance."""
     global _vector_store
     if _vector_store is None:
-        embedding_model = await get_embedding_model()
-        _vector_store = VectorStore(
-            index_dir=settings.index_dir,
-            embedding_model=embedding_model,
-        )
-        await _vector_store.initialize()
+        async with _vector_store_lock:
+            if _vector_store is None:
+                embedding_model = await get_embedding_model()
+                vector_store = VectorStore(
+                    index_dir=settings.index_dir,
+                    embedding_model=embedding_model,
+                )
+                await vector_store.initialize()
+                _vector_store = vector_store
     return _vector_store
 
 
@@ -51,8 +70,11 @@ async def get_embedding_model() -> EmbeddingModel:
     """Get or create embedding model instance."""
     global _embedding_model
     if _embedding_model is None:
-        _embedding_model = EmbeddingModel(settings.model_name)
-        await _embedding_model.initialize()
+        async with _embedding_model_lock:
+            if _embedding_model is None:
+                embedding_model = EmbeddingModel(settings.model_name)
+                await embedding_model.initialize()
+                _embedding_model = embedding_model
     return _embedding_model
 
 
@@ -60,14 +82,17 @@ async def get_retriever() -> HybridRetriever:
     """Get or create retriever instance."""
     global _retriever
     if _retriever is None:
-        vector_store = await get_vector_store()
-        document_store = await get_document_store()
-        _retriever = HybridRetriever(
-            vector_store=vector_store,
-            document_store=document_store,
-            reranker_model=settings.reranker_model if not settings.offline_mode else None,
-        )
-        await _retriever.initialize()
+        async with _retriever_lock:
+            if _retriever is None:
+                vector_store = await get_vector_store()
+                document_store = await get_document_store()
+                retriever = HybridRetriever(
+                    vector_store=vector_store,
+                    document_store=document_store,
+                    reranker_model=settings.reranker_model if not settings.offline_mode else None,
+                )
+                await retriever.initialize()
+                _retriever = retriever
     return _retriever
 
 
@@ -75,13 +100,16 @@ async def get_generator() -> AnswerGenerator:
     """Get or create answer generator instance."""
     global _generator
     if _generator is None:
-        _generator = AnswerGenerator(
-            offline_mode=settings.offline_mode,
-            provider=settings.active_llm_provider,
-            api_key=getattr(settings, f"{settings.active_llm_provider}_api_key", None)
-            if settings.active_llm_provider else None,
-        )
-        await _generator.initialize()
+        async with _generator_lock:
+            if _generator is None:
+                generator = AnswerGenerator(
+                    offline_mode=settings.offline_mode,
+                    provider=settings.active_llm_provider,
+                    api_key=getattr(settings, f"{settings.active_llm_provider}_api_key", None)
+                    if settings.active_llm_provider else None,
+                )
+                await generator.initialize()
+                _generator = generator
     return _generator
 
 
@@ -89,19 +117,29 @@ async def get_folder_watcher() -> FolderWatcher:
     """Get or create folder watcher instance."""
     global _folder_watcher
     if _folder_watcher is None:
-        document_store = await get_document_store()
-        vector_store = await get_vector_store()
-        embedding_model = await get_embedding_model()
-        
-        _folder_watcher = FolderWatcher(
-            watch_dirs=settings.parsed_watch_dirs,
-            document_store=document_store,
-            vector_store=vector_store,
-            embedding_model=embedding_model,
-        )
+        async with _folder_watcher_lock:
+            if _folder_watcher is None:
+                document_store = await get_document_store()
+                vector_store = await get_vector_store()
+                embedding_model = await get_embedding_model()
+                
+                _folder_watcher = FolderWatcher(
+                    watch_dirs=settings.parsed_watch_dirs,
+                    document_store=document_store,
+                    vector_store=vector_store,
+                    embedding_model=embedding_model,
+                )
     return _folder_watcher
 
 
+async def get_query_cache() -> QueryCache:
+    """Get or create query cache instance."""
+    global _query_cache
+    if _query_cache is None:
+        _query_cache = QueryCache(settings.index_dir.parent, settings.cache_ttl)
+    return _query_cache
+
+
 @asynccontextmanager
 async def lifespan(app):
     """Application lifespan manager."""
@@ -128,12 +166,21 @@ async def lifespan(app):
     if _folder_watcher:
         await _folder_watcher.stop()
     
+    # PDF extraction workers; nothing submits to the pool once the watcher has stopped
+    await asyncio.to_thread(shutdown_executor)
+    
     if _document_store:
         await _document_store.close()
     
+    if _generator:
+        await _generator.close()
+    
     if _vector_store:
         await _vector_store.save()
     
+    if _query_cache:
+        _query_cache.close()
+    
     logger.info("RAG Assistant shut down successfully")
 
 
@@ -10,20 +10,24 @@ from app.ingest.parsers.docx import DocxParser
 from app.ingest.parsers.csv import CSVParser
 
 
+# Parsers are stateless, so one shared instance per type serves every file
+_TEXT_PARSER = TextParser()
+_PARSERS = {
+    '.pdf': PDFParser(),
+    '.txt': _TEXT_PARSER,
+    '.md': _TEXT_PARSER,
+    '.markdown': _TEXT_PARSER,
+    '.docx': DocxParser(),
+    '.csv': CSVParser(),
+}
+
+# Extensions with a parser, for filtering directory walks before any parsing
+SUPPORTED_EXTENSIONS = frozenset(_PARSERS)
+
+
 def get_parser(file_path: Path) -> Optional[BaseParser]:
     """Get appropriate parser for file type."""
-    suffix = file_path.suffix.lower()
-    
-    parsers = {
-        '.pdf': PDFParser(),
-        '.txt': TextParser(),
-        '.md': TextParser(),
-        '.markdown': TextParser(),
-        '.docx': DocxParser(),
-        '.csv': CSVParser(),
-    }
-    
-    return parsers.get(suffix)
-
-
-__all__ = ['get_parser', 'BaseParser']
\ No newline at end of file
+    return _PARSERS.get(file_path.suffix.lower())
+
+
+__all__ = ['get_parser', 'BaseParser', 'SUPPORTED_EXTENSIONS']
\ No newline at end of file
@@ -1,14 +1,83 @@
 """Word document parser."""
 
+import asyncio
+import posixpath
+import zipfile
 from pathlib import Path
-from typing import Dict, Any
-import docx
+from typing import Dict, Any, List
 
 from app.ingest.parsers.base import BaseParser
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# WordprocessingML tags, in lxml's Clark notation
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_P, _TBL, _TR, _TC = _W + 'p', _W + 'tbl', _W + 'tr', _W + 'tc'
+_T, _TAB, _BR, _CR = _W + 't', _W + 'tab', _W + 'br', _W + 'cr'
+_BODY = _W + 'body'
+
+# Package relationships and core properties
+_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+_OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+_CORE_PROPERTIES = 'http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties'
+_DC = '{http://purl.org/dc/elements/1.1/}'
+
+
+def _element_text(el) -> str:
+    """Text of all runs under an element, with tabs and breaks as python-docx renders them."""
+    parts = []
+    for node in el.iter(_T, _TAB, _BR, _CR):
+        if node.tag == _T:
+            parts.append(node.text or '')
+        elif node.tag == _TAB:
+            parts.append('\t')
+        else:
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def _part_names(zf: zipfile.ZipFile) -> Dict[str, str]:
+    """Map package relationship types to part names from _rels/.rels."""
+    from lxml import etree
+    
+    try:
+        rels = etree.fromstring(zf.read('_rels/.rels'))
+    except KeyError:
+        return {}
+    return {
+        rel.get('Type'): posixpath.normpath(rel.get('Target', '').lstrip('/'))
+        for rel in rels.iter(_REL)
+    }
+
+
+def _table_text(tbl) -> str:
+    """Rows of a table as ' | '-joined cell text, skipping empty rows."""
+    table_data = []
+    for tr in tbl.iterchildren(_TR):
+        row_data = [
+            "\n".join(_element_text(p) for p in tc.iterchildren(_P)).strip()
+            for tc in tr.iterchildren(_TC)
+        ]
+        if any(row_data):
+            table_data.append(" | ".join(row_data))
+    return "\n".join(table_data)
+
+
+def _read_core_properties(zf: zipfile.ZipFile, part_name: str) -> Dict[str, str]:
+    """Read title, author and subject from the core properties part."""
+    from lxml import etree
+    
+    try:
+        core = etree.fromstring(zf.read(part_name))
+    except KeyError:
+        return {"title": "", "author": "", "subject": ""}
+    return {
+        "title": core.findtext(_DC + 'title') or "",
+        "author": core.findtext(_DC + 'creator') or "",
+        "subject": core.findtext(_DC + 'subject') or "",
+    }
+
 
 class DocxParser(BaseParser):
     """Parse Word documents."""
@@ -18,40 +87,53 @@ class DocxParser(BaseParser):
         if not self.validate_file(file_path):
             raise ValueError(f"Invalid file: {file_path}")
         
+        # Parsing is blocking I/O and CPU work; keep it off the event loop
+        return await asyncio.to_thread(self._parse_sync, file_path)
+    
+    def _parse_sync(self, file_path: Path) -> Dict[str, Any]:
+        """Parse DOCX file on a worker thread."""
+        # Imported on first use to keep lxml out of startup
+        from lxml import etree
+        
         try:
-            doc = docx.Document(str(file_path))
+            paragraphs: List[str] = []
+            tables_text: List[str] = []
             
-            # Extract text from paragraphs
-            paragraphs = []
-            for para in doc.paragraphs:
-                if para.text.strip():
-                    paragraphs.append(para.text)
-            
-            # Extract text from tables
-            tables_text = []
-            for table in doc.tables:
-                table_data = []
-                for row in table.rows:
-                    row_data = [cell.text.strip() for cell in row.cells]
-                    if any(row_data):
-                        table_data.append(" | ".join(row_data))
-                if table_data:
-                    tables_text.append("\n".join(table_data))
+            with zipfile.ZipFile(file_path) as zf:
+                parts = _part_names(zf)
+                document_part = parts.get(_OFFICE_DOCUMENT, 'word/document.xml')
+                
+                # Stream the body: handle each top-level paragraph or table as it
+                # closes, then free it so memory stays flat for huge documents
+                with zf.open(document_part) as xml:
+                    for _, el in etree.iterparse(xml, events=('end',), tag=(_P, _TBL)):
+                        parent = el.getparent()
+                        if parent is None or parent.tag != _BODY:
+                            # Cell paragraphs and nested tables are read with their table
+                            continue
+                        
+                        if el.tag == _P:
+                            para_text = _element_text(el)
+                            if para_text.strip():
+                                paragraphs.append(para_text)
+                        else:
+                            table_text = _table_text(el)
+                            if table_text:
+                                tables_text.append(table_text)
+                        
+                        el.clear()
+                        while el.getprevious() is not None:
+                            del parent[0]
+                
+                metadata = _read_core_properties(
+                    zf, parts.get(_CORE_PROPERTIES, 'docProps/core.xml')
+                )
             
             # Combine all text
             text = "\n\n".join(paragraphs)
             if tables_text:
                 text += "\n\n" + "\n\n".join(tables_text)
             
-            # Extract metadata
-            metadata = {}
-            if doc.core_properties:
-                metadata = {
-                    "title": doc.core_properties.title or "",
-                    "author": doc.core_properties.author or "",
-                    "subject": doc.core_properties.subject or "",
-                }
-            
             return {
                 "text": text,
                 "metadata": metadata,
@@ -1,15 +1,69 @@
 """PDF document parser."""
 
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any
-import pypdf
-from pdfminer.high_level import extract_text as pdfminer_extract
+from typing import Dict, Any, List, Optional, Tuple
 
+from app.config import settings
 from app.ingest.parsers.base import BaseParser
 from app.utils.logging import get_logger
 
+# PDF libraries are imported on first use so startup doesn't pay for them
+
 logger = get_logger(__name__)
 
+# Smaller documents are extracted inline; process start-up would dominate
+PARALLEL_MIN_PAGES = 16
+POOL_WORKERS = os.cpu_count() or 1
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+@lru_cache(maxsize=None)
+def _fitz():
+    """PyMuPDF module, or None when it is not installed."""
+    try:
+        import fitz
+    except ImportError:
+        return None
+    return fitz
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Shared process pool for CPU-bound extraction work."""
+    global _executor
+    if _executor is None:
+        # spawn: forking a process that holds torch/uvicorn threads is unsafe
+        _executor = ProcessPoolExecutor(
+            max_workers=POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop the shared process pool's workers, if it was ever started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+def _extract_pages(path: str, start: int, stop: int, backend: str) -> List[Tuple[int, str]]:
+    """Extract text for pages [start, stop); runs in a worker process."""
+    if backend == "pymupdf":
+        with _fitz().open(path) as doc:
+            return [(i, doc.load_page(i).get_text("text")) for i in range(start, stop)]
+    
+    import pypdf
+    with open(path, 'rb') as file:
+        reader = pypdf.PdfReader(file)
+        return [(i, reader.pages[i].extract_text()) for i in range(start, stop)]
+
 
 class PDFParser(BaseParser):
     """Parse PDF documents."""
@@ -21,43 +75,96 @@ class PDFParser(BaseParser):
         
         text = ""
         metadata = {}
+        parsed = False
         
-        try:
-            # Try pypdf first
-            with open(file_path, 'rb') as file:
-                reader = pypdf.PdfReader(file)
-                
-                # Extract metadata
-                if reader.metadata:
-                    metadata = {
-                        "title": reader.metadata.get('/Title', ''),
-                        "author": reader.metadata.get('/Author', ''),
-                        "subject": reader.metadata.get('/Subject', ''),
-                        "creator": reader.metadata.get('/Creator', ''),
-                    }
-                
-                # Extract text from all pages
-                pages_text = []
-                for i, page in enumerate(reader.pages, 1):
-                    page_text = page.extract_text()
-                    if page_text:
-                        pages_text.append(f"[Page {i}]\n{page_text}")
-                
-                text = "\n\n".join(pages_text)
+        if settings.pdf_backend != "pypdf" and _fitz() is not None:
+            try:
+                page_count, metadata = await asyncio.to_thread(self._read_pymupdf_info, file_path)
+                text = await self._extract_text(file_path, page_count, "pymupdf")
+                parsed = True
+            except Exception as e:
+                logger.warning(f"PyMuPDF failed, trying pypdf: {e}")
+        elif settings.pdf_backend == "pymupdf":
+            logger.warning("PDF_BACKEND=pymupdf but PyMuPDF is not installed, using pypdf")
         
-        except Exception as e:
-            logger.warning(f"pypdf failed, trying pdfminer: {e}")
-            
-            # Fallback to pdfminer
+        if not parsed:
             try:
-                text = pdfminer_extract(str(file_path))
-            except Exception as e2:
-                logger.error(f"Both PDF parsers failed: {e2}")
-                raise
+                # Try pypdf first
+                page_count, metadata = await asyncio.to_thread(self._read_pypdf_info, file_path)
+                text = await self._extract_text(file_path, page_count, "pypdf")
+            
+            except Exception as e:
+                logger.warning(f"pypdf failed, trying pdfminer: {e}")
+                
+                # Fallback to pdfminer
+                try:
+                    from pdfminer.high_level import extract_text as pdfminer_extract
+                    text = await asyncio.to_thread(pdfminer_extract, str(file_path))
+                except Exception as e2:
+                    logger.error(f"Both PDF parsers failed: {e2}")
+                    raise
         
         return {
             "text": text,
             "metadata": metadata,
             "mime_type": "application/pdf",
             "title": metadata.get("title") or file_path.stem,
-        }
\ No newline at end of file
+        }
+    
+    async def _extract_text(self, file_path: Path, page_count: int, backend: str) -> str:
+        """Extract all pages, splitting large documents across the process pool."""
+        if page_count < PARALLEL_MIN_PAGES or POOL_WORKERS == 1:
+            pages = await asyncio.to_thread(
+                _extract_pages, str(file_path), 0, page_count, backend
+            )
+        else:
+            loop = asyncio.get_running_loop()
+            executor = get_executor()
+            step = -(-page_count // POOL_WORKERS)
+            
+            batches = await asyncio.gather(*(
+                loop.run_in_executor(
+                    executor, _extract_pages, str(file_path),
+                    start, min(start + step, page_count), backend
+                )
+                for start in range(0, page_count, step)
+            ))
+            pages = [page for batch in batches for page in batch]
+        
+        return "\n\n".join(
+            f"[Page {i + 1}]\n{page_text}"
+            for i, page_text in pages
+            if page_text
+        )
+    
+    def _read_pymupdf_info(self, file_path: Path) -> Tuple[int, Dict[str, Any]]:
+        """Read page count and metadata with PyMuPDF."""
+        with _fitz().open(str(file_path)) as doc:
+            doc_meta = doc.metadata or {}
+            metadata = {
+                "title": doc_meta.get("title", ""),
+                "author": doc_meta.get("author", ""),
+                "subject": doc_meta.get("subject", ""),
+                "creator": doc_meta.get("creator", ""),
+            }
+            return doc.page_count, metadata
+    
+    def _read_pypdf_info(self, file_path: Path) -> Tuple[int, Dict[str, Any]]:
+        """Read page count and metadata with pypdf."""
+        import pypdf
+        
+        metadata = {}
+        
+        with open(file_path, 'rb') as file:
+            reader = pypdf.PdfReader(file)
+            
+            # Extract metadata
+            if reader.metadata:
+                metadata = {
+                    "title": reader.metadata.get('/Title', ''),
+                    "author": reader.metadata.get('/Author', ''),
+                    "subject": reader.metadata.get('/Subject', ''),
+                    "creator": reader.metadata.get('/Creator', ''),
+                }
+            
+            return len(reader.pages), metadata
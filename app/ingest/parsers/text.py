@@ -1,14 +1,34 @@
 """Plain text and markdown parser."""
 
+import asyncio
 from pathlib import Path
 from typing import Dict, Any
-import chardet
 
 from app.ingest.parsers.base import BaseParser
 from app.utils.logging import get_logger
 
+try:
+    from cchardet import UniversalDetector
+except ImportError:
+    from chardet.universaldetector import UniversalDetector
+
 logger = get_logger(__name__)
 
+# Detection usually converges within the first few blocks
+DETECT_BLOCK_SIZE = 64 * 1024
+
+
+def detect_encoding(file_path: Path) -> str:
+    """Detect a file's encoding by feeding blocks until the detector is confident."""
+    detector = UniversalDetector()
+    with open(file_path, 'rb') as file:
+        while block := file.read(DETECT_BLOCK_SIZE):
+            detector.feed(block)
+            if detector.done:
+                break
+    detector.close()
+    return detector.result['encoding'] or 'utf-8'
+
 
 class TextParser(BaseParser):
     """Parse plain text and markdown files."""
@@ -18,18 +38,22 @@ class TextParser(BaseParser):
         if not self.validate_file(file_path):
             raise ValueError(f"Invalid file: {file_path}")
         
+        # Parsing is blocking I/O and CPU work; keep it off the event loop
+        return await asyncio.to_thread(self._parse_sync, file_path)
+    
+    def _parse_sync(self, file_path: Path) -> Dict[str, Any]:
+        """Parse text file on a worker thread."""
         # Detect encoding
-        with open(file_path, 'rb') as file:
-            raw_data = file.read()
-            result = chardet.detect(raw_data)
-            encoding = result['encoding'] or 'utf-8'
+        encoding = detect_encoding(file_path)
         
-        # Read text
+        # Read text (newline='' keeps line endings as they are on disk)
         try:
-            text = raw_data.decode(encoding)
-        except UnicodeDecodeError:
+            with open(file_path, 'r', encoding=encoding, newline='') as file:
+                text = file.read()
+        except (UnicodeDecodeError, LookupError):
             # Fallback to utf-8 with errors ignored
-            text = raw_data.decode('utf-8', errors='ignore')
+            with open(file_path, 'r', encoding='utf-8', errors='ignore', newline='') as file:
+                text = file.read()
             logger.warning(f"Encoding issues in {file_path}, some characters may be lost")
         
         # Extract title from markdown
@@ -1,11 +1,12 @@
 """Document ingestion pipeline."""
 
 import asyncio
+import fnmatch
+import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import hashlib
+from typing import AbstractSet, Iterator, List, Dict, Any, Optional, Tuple
 
-from app.ingest.parsers import get_parser
+from app.ingest.parsers import get_parser, SUPPORTED_EXTENSIONS
 from app.ingest.preprocessor import TextPreprocessor
 from app.core.chunker import TextChunker, ChunkConfig
 from app.core.language import LanguageDetector
@@ -18,6 +19,34 @@ from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Texts per add_embeddings call when flushing deferred chunks
+FLUSH_BATCH_SIZE = 256
+# Texts above this many characters are preprocessed on a worker thread
+OFFLOAD_PREPROCESS_CHARS = 1_000_000
+
+
+def _walk_files(
+    directory: Path,
+    pattern: str,
+    recursive: bool,
+    extensions: AbstractSet[str],
+    ignore_dirs: AbstractSet[str],
+) -> Iterator[Path]:
+    """Yield files with a wanted extension, never descending into hidden or ignored dirs."""
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and not entry.name.startswith('.') and entry.name not in ignore_dirs:
+                        stack.append(Path(entry.path))
+                elif (
+                    os.path.splitext(entry.name)[1].lower() in extensions
+                    and (pattern == "*" or fnmatch.fnmatch(entry.name, pattern))
+                    and entry.is_file()
+                ):
+                    yield Path(entry.path)
+
 
 class IngestionPipeline:
     """Orchestrates document ingestion process."""
@@ -37,16 +66,29 @@ class IngestionPipeline:
         self.chunker = TextChunker(ChunkConfig(
             chunk_size=settings.chunk_size,
             chunk_overlap=settings.chunk_overlap,
+            # Every sentence of a document is tokenized in one batched call
+            token_len_batch=embedding_model.token_lengths if settings.chunk_by_tokens else None,
         ))
         self.language_detector = LanguageDetector()
         self.deduplicator = Deduplicator()
+        
+        # (text, embedding_id, metadata) waiting for a batched add_embeddings
+        self._pending: List[Tuple[str, str, Dict[str, Any]]] = []
+        # Document ID -> (checksum, file hash, mtime, size), recorded once the flush succeeds
+        self._pending_documents: Dict[int, Tuple[str, str, int, int]] = {}
     
     async def ingest_file(
         self,
         file_path: Path,
-        force: bool = False
+        force: bool = False,
+        defer_flush: bool = False
     ) -> Dict[str, Any]:
-        """Ingest a single file."""
+        """Ingest a single file.
+        
+        With defer_flush, embeddings are queued for flush_pending() instead of
+        being added and saved per file, and the document stays pending (so it is
+        ingested again by the next scan) until that flush succeeds.
+        """
         try:
             logger.info(f"Ingesting file: {file_path}")
             
@@ -61,6 +103,24 @@ class IngestionPipeline:
                 logger.warning(f"No parser available for: {file_path}")
                 return {"status": "skipped", "message": "Unsupported file type"}
             
+            # Same mtime and size as last time: unchanged without reading the file
+            stat = file_path.stat()
+            doc = None
+            if not force:
+                doc = await self.document_store.get_document(file_path)
+                if doc and doc.mtime_ns == stat.st_mtime_ns and doc.raw_size == stat.st_size:
+                    logger.debug(f"File unchanged: {file_path}")
+                    return {"status": "unchanged", "message": "File already indexed"}
+            
+            # Hash raw bytes so unchanged files skip parsing entirely
+            file_hash = await asyncio.to_thread(self.document_store.compute_file_hash, file_path)
+            if doc and doc.file_hash == file_hash:
+                await self.document_store.update_file_state(
+                    doc.id, file_hash, stat.st_mtime_ns, stat.st_size
+                )
+                logger.debug(f"File unchanged: {file_path}")
+                return {"status": "unchanged", "message": "File already indexed"}
+            
             # Parse document
             content = await parser.parse(file_path)
             if not content or not content.get("text"):
@@ -68,65 +128,91 @@ class IngestionPipeline:
                 return {"status": "skipped", "message": "No text content"}
             
             # Check for duplicates
-            if not force:
-                doc = await self.document_store.get_document(file_path)
-                if doc:
-                    checksum = self.document_store.compute_checksum(content["text"])
-                    if doc.checksum == checksum:
-                        logger.debug(f"File unchanged: {file_path}")
-                        return {"status": "unchanged", "message": "File already indexed"}
+            if doc:
+                checksum = self.document_store.compute_checksum(content["text"])
+                if doc.checksum == checksum:
+                    await self.document_store.update_file_state(
+                        doc.id, file_hash, stat.st_mtime_ns, stat.st_size
+                    )
+                    logger.debug(f"File unchanged: {file_path}")
+                    return {"status": "unchanged", "message": "File already indexed"}
             
             # Preprocess text
-            processed_text = self.preprocessor.process(content["text"])
+            if len(content["text"]) > OFFLOAD_PREPROCESS_CHARS:
+                processed_text = await asyncio.to_thread(self.preprocessor.process, content["text"])
+            else:
+                processed_text = self.preprocessor.process(content["text"])
             
             # Detect language
             language = self.language_detector.detect(processed_text)
             
-            # Add document to store
-            document = await self.document_store.add_document(
-                file_path=file_path,
-                content=processed_text,
-                mime_type=content.get("mime_type", "text/plain"),
-                language=language,
-                title=content.get("title"),
-                metadata=content.get("metadata"),
-            )
-            
             # Chunk text
-            chunks = self.chunker.chunk_text(
-                processed_text,
-                metadata={"document_id": document.id}
-            )
+            chunks = self.chunker.chunk_text(processed_text)
             
             # Deduplicate chunks
             chunks = self.deduplicator.deduplicate_chunks(chunks)
             
+            # Document row and its chunks are written in one transaction; chunking
+            # happens first so the write lock is held only for the inserts
+            async with self.document_store.ingest_session() as session:
+                document = await self.document_store.add_document(
+                    file_path=file_path,
+                    content=processed_text,
+                    mime_type=content.get("mime_type", "text/plain"),
+                    language=language,
+                    title=content.get("title"),
+                    metadata=content.get("metadata"),
+                    file_hash=file_hash,
+                    mtime_ns=stat.st_mtime_ns,
+                    raw_size=stat.st_size,
+                    session=session,
+                    pending=defer_flush,
+                )
+                
+                # One read-only metadata dict shared by every chunk of the document
+                document_metadata = {"document_id": document.id}
+                embedding_ids = [
+                    f"doc_{document.id}_chunk_{i}" 
+                    for i in range(len(chunks))
+                ]
+                for chunk, embedding_id in zip(chunks, embedding_ids):
+                    chunk["embedding_id"] = embedding_id
+                    chunk["metadata"] = document_metadata
+                
+                await self.document_store.add_chunks(document.id, chunks, session=session)
+            
+            if defer_flush:
+                self._pending_documents[document.id] = (
+                    self.document_store.compute_checksum(processed_text),
+                    file_hash,
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                )
+            
             if not chunks:
                 logger.warning(f"No chunks created for: {file_path}")
                 return {"status": "error", "message": "No chunks created"}
             
             # Generate embeddings and store
             chunk_texts = [chunk["text"] for chunk in chunks]
-            embedding_ids = [
-                f"doc_{document.id}_chunk_{i}" 
-                for i in range(len(chunks))
-            ]
+            chunk_metadata = [document_metadata] * len(chunks)
             
             # Add embeddings to vector store
-            await self.vector_store.add_embeddings(
-                texts=chunk_texts,
-                embedding_ids=embedding_ids,
-                metadata=[{"document_id": document.id} for _ in chunks]
-            )
-            
-            # Store chunks in database
-            for chunk, embedding_id in zip(chunks, embedding_ids):
-                chunk["embedding_id"] = embedding_id
-            
-            await self.document_store.add_chunks(document.id, chunks)
+            if defer_flush:
+                self._pending.extend(zip(chunk_texts, embedding_ids, chunk_metadata))
+            else:
+                # Feed the model exactly one batch per call
+                batch = settings.batch_size
+                for start in range(0, len(chunk_texts), batch):
+                    await self.vector_store.add_embeddings(
+                        texts=chunk_texts[start:start + batch],
+                        embedding_ids=embedding_ids[start:start + batch],
+                        metadata=chunk_metadata[start:start + batch]
+                    )
             
             # Save vector store
-            await self.vector_store.save()
+            if not defer_flush:
+                await self.vector_store.save()
             
             logger.info(f"Successfully ingested: {file_path} ({len(chunks)} chunks)")
             
@@ -145,9 +231,10 @@ class IngestionPipeline:
         self,
         directory: Path,
         pattern: str = "*",
-        recursive: bool = True
+        recursive: bool = True,
+        extensions: AbstractSet[str] = SUPPORTED_EXTENSIONS
     ) -> Dict[str, Any]:
-        """Ingest all files in a directory."""
+        """Ingest all files in a directory that have one of the given extensions."""
         results = {
             "total": 0,
             "success": 0,
@@ -156,31 +243,55 @@ class IngestionPipeline:
             "files": []
         }
         
-        # Find files
-        if recursive:
-            files = list(directory.rglob(pattern))
-        else:
-            files = list(directory.glob(pattern))
+        # Find files, filtering by extension during the walk
+        files = await asyncio.to_thread(list, _walk_files(
+            directory, pattern, recursive, extensions, settings.parsed_ignore_dirs
+        ))
         
         results["total"] = len(files)
         logger.info(f"Found {len(files)} files to ingest")
         
-        # Process files
-        for file_path in files:
-            if file_path.is_file():
-                result = await self.ingest_file(file_path)
-                
-                results["files"].append({
-                    "path": str(file_path),
-                    "status": result["status"]
-                })
-                
-                if result["status"] == "success":
-                    results["success"] += 1
-                elif result["status"] in ["skipped", "unchanged"]:
-                    results["skipped"] += 1
-                else:
-                    results["failed"] += 1
+        # Process files concurrently, bounded so parsing and embedding don't oversubscribe
+        semaphore = asyncio.Semaphore(settings.ingest_concurrency)
+        
+        async def _ingest_one(file_path: Path) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.ingest_file(file_path, defer_flush=True)
+        
+        file_results = await asyncio.gather(
+            *(_ingest_one(file_path) for file_path in files),
+            return_exceptions=True
+        )
+        
+        for file_path, result in zip(files, file_results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to ingest {file_path}: {result}")
+                result = {"status": "error", "message": str(result)}
+            
+            results["files"].append({
+                "path": str(file_path),
+                "status": result["status"]
+            })
+            
+            if result["status"] == "success":
+                results["success"] += 1
+            elif result["status"] in ["skipped", "unchanged"]:
+                results["skipped"] += 1
+            else:
+                results["failed"] += 1
+        
+        # One embedding pass and a single index save for the whole directory
+        try:
+            await self.flush_pending()
+        except Exception as e:
+            # The documents stay pending, so the next scan ingests them again
+            logger.error(f"Failed to flush deferred embeddings for {directory}: {e}")
+            results["error"] = str(e)
+            for file_result in results["files"]:
+                if file_result["status"] == "success":
+                    file_result["status"] = "error"
+            results["failed"] += results["success"]
+            results["success"] = 0
         
         logger.info(
             f"Ingestion complete: {results['success']} success, "
@@ -189,6 +300,27 @@ class IngestionPipeline:
         
         return results
     
+    async def flush_pending(self) -> int:
+        """Embed queued chunks in large batches, save the index once, then mark documents indexed."""
+        pending, self._pending = self._pending, []
+        documents, self._pending_documents = self._pending_documents, {}
+        if not pending:
+            await self.document_store.mark_indexed(documents)
+            return 0
+        
+        for start in range(0, len(pending), FLUSH_BATCH_SIZE):
+            texts, embedding_ids, metadata = zip(*pending[start:start + FLUSH_BATCH_SIZE])
+            await self.vector_store.add_embeddings(
+                texts=list(texts),
+                embedding_ids=list(embedding_ids),
+                metadata=list(metadata)
+            )
+        
+        await self.vector_store.save()
+        await self.document_store.mark_indexed(documents)
+        logger.info(f"Flushed {len(pending)} deferred embeddings")
+        return len(pending)
+    
     async def delete_document(self, file_path: Path) -> bool:
         """Remove a document from the index."""
         logger.info(f"Deleting document: {file_path}")
@@ -199,9 +331,8 @@ class IngestionPipeline:
             logger.warning(f"Document not found: {file_path}")
             return False
         
-        # Get chunks to remove from vector store
-        chunks = await self.document_store.get_chunks(doc.id)
-        embedding_ids = [chunk.embedding_id for chunk in chunks if chunk.embedding_id]
+        # Get chunk embeddings to remove from vector store
+        embedding_ids = await self.document_store.get_embedding_ids(doc.id)
         
         # Remove from vector store
         if embedding_ids:
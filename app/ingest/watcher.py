@@ -2,7 +2,7 @@
 
 import asyncio
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Set
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 
@@ -14,14 +14,21 @@ from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Quiet period after the last event before a file is ingested
+DEBOUNCE_SECONDS = 1.0
+
 
 class FileChangeHandler(FileSystemEventHandler):
     """Handle file system events."""
     
     def __init__(self, watcher: 'FolderWatcher'):
         self.watcher = watcher
-        self.pending_files: Set[Path] = set()
         self.loop = asyncio.get_event_loop()
+        # Loop-thread state only: rolling debounce timers, running ingests,
+        # and paths that changed again while being ingested
+        self._timers: Dict[Path, asyncio.TimerHandle] = {}
+        self._in_flight: Set[Path] = set()
+        self._rerun: Set[Path] = set()
     
     def on_created(self, event: FileSystemEvent):
         """Handle file creation."""
@@ -45,19 +52,47 @@ class FileChangeHandler(FileSystemEventHandler):
             self.schedule_deletion(file_path)
     
     def schedule_ingestion(self, file_path: Path):
-        """Schedule file for ingestion."""
-        self.pending_files.add(file_path)
-        asyncio.run_coroutine_threadsafe(
-            self.watcher.ingest_file(file_path),
-            self.loop
-        )
+        """Schedule file for ingestion once its events go quiet."""
+        self.loop.call_soon_threadsafe(self._debounce, file_path)
     
     def schedule_deletion(self, file_path: Path):
         """Schedule file for deletion."""
+        self.loop.call_soon_threadsafe(self._cancel_timer, file_path)
         asyncio.run_coroutine_threadsafe(
             self.watcher.delete_file(file_path),
             self.loop
         )
+    
+    def _debounce(self, file_path: Path):
+        """Restart the file's quiet-period timer (runs on the loop thread)."""
+        self._cancel_timer(file_path)
+        self._timers[file_path] = self.loop.call_later(
+            DEBOUNCE_SECONDS, self._start_ingestion, file_path
+        )
+    
+    def _cancel_timer(self, file_path: Path):
+        """Drop a pending debounce timer, if any."""
+        timer = self._timers.pop(file_path, None)
+        if timer:
+            timer.cancel()
+    
+    def _start_ingestion(self, file_path: Path):
+        """Ingest now, or once more after the running ingest if one is in flight."""
+        self._timers.pop(file_path, None)
+        if file_path in self._in_flight:
+            self._rerun.add(file_path)
+            return
+        
+        self._in_flight.add(file_path)
+        task = self.loop.create_task(self.watcher.ingest_file(file_path))
+        task.add_done_callback(lambda _: self._finish_ingestion(file_path))
+    
+    def _finish_ingestion(self, file_path: Path):
+        """Clear in-flight state and pick up changes made during the ingest."""
+        self._in_flight.discard(file_path)
+        if file_path in self._rerun:
+            self._rerun.discard(file_path)
+            self._debounce(file_path)
 
 
 class FolderWatcher:
@@ -134,9 +169,6 @@ class FolderWatcher:
     async def ingest_file(self, file_path: Path):
         """Ingest a single file."""
         try:
-            # Add small delay to ensure file is fully written
-            await asyncio.sleep(0.5)
-            
             # Check if file still exists
             if file_path.exists():
                 await self.pipeline.ingest_file(file_path)
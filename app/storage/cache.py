@@ -1,32 +1,61 @@
 """Simple caching layer for queries and responses."""
 
-import json
 import hashlib
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 
+import numpy as np
+
 from app.utils.logging import get_logger
+from app.utils.serialization import dumps, loads
 
 logger = get_logger(__name__)
 
+try:
+    import xxhash
+    
+    def _key_digest(key_string: str) -> str:
+        return xxhash.xxh3_64_hexdigest(key_string)
+except ImportError:
+    def _key_digest(key_string: str) -> str:
+        return hashlib.blake2b(key_string.encode(), digest_size=8, usedforsecurity=False).hexdigest()
+
 
 class QueryCache:
-    """Simple file-based cache for query results."""
+    """SQLite-backed cache for query results with an in-memory LRU front."""
     
-    def __init__(self, cache_dir: Path, ttl_seconds: int = 3600):
-        self.cache_dir = cache_dir / "query_cache"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.ttl = timedelta(seconds=ttl_seconds)
+    def __init__(self, cache_dir: Path, ttl_seconds: int = 3600, memory_size: int = 512):
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = cache_dir / "query_cache.db"
+        self.ttl = ttl_seconds
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        
+        # Autocommit; each get/set is a single statement
+        self._conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_cache ("
+            "key TEXT PRIMARY KEY, timestamp REAL NOT NULL, data BLOB NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_query_cache_timestamp ON query_cache(timestamp)"
+        )
     
     def _get_cache_key(self, query: str, mode: str, top_k: int) -> str:
         """Generate cache key from query parameters."""
         key_string = f"{query.lower().strip()}:{mode}:{top_k}"
-        return hashlib.md5(key_string.encode()).hexdigest()
+        return _key_digest(key_string)
     
-    def _get_cache_path(self, cache_key: str) -> Path:
-        """Get cache file path."""
-        return self.cache_dir / f"{cache_key}.json"
+    def _remember(self, cache_key: str, timestamp: float, data: Dict[str, Any]) -> None:
+        """Put an entry in the in-memory LRU, evicting the oldest."""
+        self._memory[cache_key] = (timestamp, data)
+        self._memory.move_to_end(cache_key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
     
     async def get(
         self,
@@ -36,23 +65,29 @@ class QueryCache:
     ) -> Optional[Dict[str, Any]]:
         """Get cached result if available and not expired."""
         cache_key = self._get_cache_key(query, mode, top_k)
-        cache_path = self._get_cache_path(cache_key)
+        cutoff = time.time() - self.ttl
         
-        if not cache_path.exists():
-            return None
+        hit = self._memory.get(cache_key)
+        if hit is not None:
+            if hit[0] >= cutoff:
+                self._memory.move_to_end(cache_key)
+                logger.debug(f"Cache hit for query: {query[:50]}...")
+                return hit[1]
+            del self._memory[cache_key]
         
         try:
-            with open(cache_path, "r") as f:
-                cached = json.load(f)
-            
-            # Check expiration
-            cached_time = datetime.fromisoformat(cached["timestamp"])
-            if datetime.utcnow() - cached_time > self.ttl:
-                cache_path.unlink()
+            row = self._conn.execute(
+                "SELECT timestamp, data FROM query_cache WHERE key = ? AND timestamp >= ?",
+                (cache_key, cutoff),
+            ).fetchone()
+            if row is None:
                 return None
             
+            timestamp, data = row[0], loads(row[1])
+            self._remember(cache_key, timestamp, data)
+            
             logger.debug(f"Cache hit for query: {query[:50]}...")
-            return cached["data"]
+            return data
         except Exception as e:
             logger.error(f"Failed to read cache: {e}")
             return None
@@ -66,19 +101,16 @@ class QueryCache:
     ) -> None:
         """Cache query result."""
         cache_key = self._get_cache_key(query, mode, top_k)
-        cache_path = self._get_cache_path(cache_key)
+        now = time.time()
         
         try:
-            cached = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "query": query,
-                "mode": mode,
-                "top_k": top_k,
-                "data": data
-            }
-            
-            with open(cache_path, "w") as f:
-                json.dump(cached, f)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO query_cache (key, timestamp, data) VALUES (?, ?, ?)",
+                (cache_key, now, dumps(data)),
+            )
+            # Expired rows go in one indexed range delete
+            self._conn.execute("DELETE FROM query_cache WHERE timestamp < ?", (now - self.ttl,))
+            self._remember(cache_key, now, data)
             
             logger.debug(f"Cached result for query: {query[:50]}...")
         except Exception as e:
@@ -86,6 +118,77 @@ class QueryCache:
     
     async def clear(self) -> None:
         """Clear all cached results."""
-        for cache_file in self.cache_dir.glob("*.json"):
-            cache_file.unlink()
-        logger.info("Cleared query cache")
\ No newline at end of file
+        self._memory.clear()
+        self._conn.execute("DELETE FROM query_cache")
+        logger.info("Cleared query cache")
+    
+    def close(self) -> None:
+        """Close the cache database."""
+        self._conn.close()
+
+
+class SemanticCache:
+    """In-process LRU of search results, matched by exact query or by query-embedding similarity.
+    
+    Entries are only valid for one index version; sync() drops them when the index changes.
+    """
+    
+    def __init__(self, max_entries: int = 1024, min_similarity: float = 0.97):
+        self.max_entries = max_entries
+        self.min_similarity = min_similarity
+        self.version: Optional[int] = None
+        # key -> (normalized query embedding, params, results)
+        self._entries: "OrderedDict[bytes, Tuple[np.ndarray, Tuple, List]]" = OrderedDict()
+        self._matrix: Optional[np.ndarray] = None  # Stacked embeddings, rebuilt after changes
+        self._keys: List[bytes] = []
+    
+    @staticmethod
+    def make_key(query: str, params: Tuple) -> bytes:
+        """Hash of the normalized query and search parameters."""
+        key_string = f"{' '.join(query.lower().split())}|{params}"
+        return hashlib.blake2b(key_string.encode(), digest_size=16, usedforsecurity=False).digest()
+    
+    def sync(self, version: int) -> None:
+        """Drop every entry if the index has changed since they were stored."""
+        if version != self.version:
+            self._entries.clear()
+            self._matrix = None
+            self.version = version
+    
+    def get_exact(self, key: bytes) -> Optional[List]:
+        """Results for an exact repeat of a cached query."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+    
+    def get_similar(self, embedding: np.ndarray, params: Tuple) -> Optional[List]:
+        """Results for the most similar cached query with the same parameters, if close enough."""
+        if not self._entries:
+            return None
+        
+        if self._matrix is None:
+            self._keys = list(self._entries)
+            self._matrix = np.stack([self._entries[key][0] for key in self._keys])
+        
+        # One matrix-vector product scores every cached query
+        sims = self._matrix @ embedding
+        for i in np.argsort(-sims):
+            if sims[i] < self.min_similarity:
+                break
+            key = self._keys[i]
+            if self._entries[key][1] == params:
+                self._entries.move_to_end(key)
+                return self._entries[key][2]
+        return None
+    
+    def put(self, key: bytes, embedding: np.ndarray, params: Tuple, results: List) -> None:
+        """Store results, evicting the least recently used entry when full."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (embedding, params, results)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._matrix = None
@@ -2,17 +2,34 @@
 
 import hashlib
 import json
+import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from sqlalchemy import select, delete, update
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+from sqlalchemy import select, delete, insert, update, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.storage.models import Document, Chunk, Query, Citation, get_engine
+from app.storage.models import Document, Chunk, Query, Citation, add_missing_columns, get_engine
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Block size for the pre-3.11 hashing loop; peak memory stays at one block
+HASH_BLOCK_SIZE = 1024 * 1024  # 1 MiB
+# Checksum of a document whose embeddings are not saved yet; it never matches real text
+PENDING_CHECKSUM = ""
+
+try:
+    import xxhash
+    
+    def _new_file_hasher():
+        return xxhash.xxh3_128()
+except ImportError:
+    def _new_file_hasher():
+        return hashlib.blake2b(digest_size=16, usedforsecurity=False)
+
 
 class DocumentStore:
     """Manages document metadata in SQLite."""
@@ -26,6 +43,13 @@ class DocumentStore:
         """Initialize the document store."""
         self.engine = get_engine(self.db_path)
         self.async_session = async_sessionmaker(self.engine, expire_on_commit=False)
+        
+        # Databases from older versions (or restored snapshots) may predate some columns
+        async with self.engine.begin() as conn:
+            added = await conn.run_sync(add_missing_columns)
+        if added:
+            logger.info(f"Added missing columns: {', '.join(added)}")
+        
         logger.info(f"Document store initialized at {self.db_path}")
     
     async def close(self):
@@ -33,9 +57,43 @@ class DocumentStore:
         if self.engine:
             await self.engine.dispose()
     
+    async def checkpoint(self):
+        """Fold the WAL into the main database file so it can be copied on its own."""
+        async with self.engine.connect() as conn:
+            await conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    
+    @asynccontextmanager
+    async def ingest_session(self) -> AsyncIterator[AsyncSession]:
+        """One session and transaction for a whole document write, committed on exit."""
+        async with self.async_session() as session:
+            async with session.begin():
+                yield session
+    
+    @asynccontextmanager
+    async def _session_scope(self, session: Optional[AsyncSession]) -> AsyncIterator[AsyncSession]:
+        """Use the caller's session, or open a transaction of our own."""
+        if session is not None:
+            yield session
+        else:
+            async with self.ingest_session() as session:
+                yield session
+    
     def compute_checksum(self, content: str) -> str:
         """Compute SHA256 checksum of content."""
-        return hashlib.sha256(content.encode()).hexdigest()
+        return hashlib.sha256(content.encode(), usedforsecurity=False).hexdigest()
+    
+    def compute_file_hash(self, file_path: Path) -> str:
+        """Compute a fast hash of the raw file bytes, streamed in fixed-size blocks."""
+        with open(file_path, 'rb', buffering=0) as file:
+            if hasattr(hashlib, 'file_digest'):
+                # Python 3.11+: the read/update loop runs in C
+                return hashlib.file_digest(file, _new_file_hasher).hexdigest()
+            
+            hasher = _new_file_hasher()
+            buf = memoryview(bytearray(HASH_BLOCK_SIZE))
+            while n := file.readinto(buf):
+                hasher.update(buf[:n])
+            return hasher.hexdigest()
     
     async def add_document(
         self,
@@ -45,81 +103,147 @@ class DocumentStore:
         language: Optional[str] = None,
         title: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        file_hash: Optional[str] = None,
+        mtime_ns: Optional[int] = None,
+        raw_size: Optional[int] = None,
+        session: Optional[AsyncSession] = None,
+        pending: bool = False,
     ) -> Document:
-        """Add or update a document."""
-        async with self.async_session() as session:
-            # Check if document exists
-            stmt = select(Document).where(Document.file_path == str(file_path))
-            result = await session.execute(stmt)
-            existing_doc = result.scalar_one_or_none()
-            
+        """Add or update a document, within session's transaction when given.
+        
+        A pending document is stored without checksum or file state, so scans keep
+        re-ingesting it until mark_indexed() records them.
+        """
+        if pending:
+            checksum, file_hash, mtime_ns, raw_size = PENDING_CHECKSUM, None, None, None
+        else:
             checksum = self.compute_checksum(content)
+        now = datetime.utcnow()
+        
+        async with self._session_scope(session) as session:
+            # One INSERT ... ON CONFLICT DO UPDATE; the update (and RETURNING row)
+            # only happens when the text changed
+            stmt = sqlite_insert(Document).values(
+                file_path=str(file_path),
+                filename=file_path.name,
+                file_size=len(content),
+                mime_type=mime_type,
+                checksum=checksum,
+                file_hash=file_hash,
+                mtime_ns=mtime_ns,
+                raw_size=raw_size,
+                language=language,
+                title=title or file_path.name,
+                created_at=now,
+                modified_at=now,
+                indexed_at=now,
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Document.file_path],
+                set_={
+                    "checksum": stmt.excluded.checksum,
+                    "file_hash": stmt.excluded.file_hash,
+                    "mtime_ns": stmt.excluded.mtime_ns,
+                    "raw_size": stmt.excluded.raw_size,
+                    "file_size": stmt.excluded.file_size,
+                    "mime_type": stmt.excluded.mime_type,
+                    "language": stmt.excluded.language,
+                    "title": stmt.excluded.title,
+                    "modified_at": now,
+                    "indexed_at": now,
+                },
+                where=(Document.checksum != stmt.excluded.checksum)
+                | (Document.checksum == PENDING_CHECKSUM),
+            ).returning(Document)
             
-            if existing_doc:
-                # Update existing document
-                if existing_doc.checksum != checksum:
-                    existing_doc.checksum = checksum
-                    existing_doc.file_size = len(content)
-                    existing_doc.mime_type = mime_type
-                    existing_doc.language = language
-                    existing_doc.title = title or file_path.name
-                    existing_doc.modified_at = datetime.utcnow()
-                    existing_doc.indexed_at = datetime.utcnow()
-                    
-                    # Delete old chunks
-                    await session.execute(
-                        delete(Chunk).where(Chunk.document_id == existing_doc.id)
-                    )
-                    
-                    await session.commit()
-                    logger.info(f"Updated document: {file_path}")
-                    return existing_doc
-                else:
-                    logger.debug(f"Document unchanged: {file_path}")
-                    return existing_doc
-            else:
-                # Create new document
-                doc = Document(
-                    file_path=str(file_path),
-                    filename=file_path.name,
-                    file_size=len(content),
-                    mime_type=mime_type,
-                    checksum=checksum,
-                    language=language,
-                    title=title or file_path.name,
-                )
-                session.add(doc)
-                await session.commit()
-                await session.refresh(doc)
-                logger.info(f"Added document: {file_path}")
+            result = await session.scalars(stmt, execution_options={"populate_existing": True})
+            doc = result.one_or_none()
+            
+            if doc is not None:
+                # Old chunks of an updated document (none for a new one)
+                await session.execute(delete(Chunk).where(Chunk.document_id == doc.id))
+                logger.info(f"Indexed document: {file_path}")
                 return doc
+            
+            # Text unchanged
+            stmt = select(Document).where(Document.file_path == str(file_path))
+            existing_doc = (await session.execute(stmt)).scalar_one()
+            if file_hash and existing_doc.file_hash != file_hash:
+                # Bytes changed but the text did not; remember the new hash
+                existing_doc.file_hash = file_hash
+                existing_doc.mtime_ns = mtime_ns
+                existing_doc.raw_size = raw_size
+                await session.flush()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Document unchanged: {file_path}")
+            return existing_doc
     
-    async def add_chunks(
+    async def update_file_state(
         self,
         document_id: int,
-        chunks: List[Dict[str, Any]],
-    ) -> List[Chunk]:
-        """Add chunks for a document."""
+        file_hash: str,
+        mtime_ns: int,
+        raw_size: int,
+    ) -> None:
+        """Record the hash and stat of a file whose content is already indexed."""
         async with self.async_session() as session:
-            chunk_objects = []
-            
-            for i, chunk_data in enumerate(chunks):
-                chunk = Chunk(
-                    document_id=document_id,
-                    chunk_index=i,
-                    text=chunk_data["text"],
-                    start_char=chunk_data.get("start_char"),
-                    end_char=chunk_data.get("end_char"),
-                    page_number=chunk_data.get("page_number"),
-                    metadata_json=json.dumps(chunk_data.get("metadata", {})),
-                    embedding_id=chunk_data.get("embedding_id"),
-                )
-                session.add(chunk)
-                chunk_objects.append(chunk)
-            
+            await session.execute(
+                update(Document)
+                .where(Document.id == document_id)
+                .values(file_hash=file_hash, mtime_ns=mtime_ns, raw_size=raw_size)
+            )
             await session.commit()
+    
+    async def mark_indexed(self, states: Dict[int, Tuple[str, str, int, int]]) -> None:
+        """Record (checksum, file hash, mtime, size) for pending documents now fully indexed."""
+        if not states:
+            return
+        
+        async with self.ingest_session() as session:
+            await session.execute(
+                update(Document),
+                [
+                    {
+                        "id": document_id,
+                        "checksum": checksum,
+                        "file_hash": file_hash,
+                        "mtime_ns": mtime_ns,
+                        "raw_size": raw_size,
+                    }
+                    for document_id, (checksum, file_hash, mtime_ns, raw_size) in states.items()
+                ],
+            )
+    
+    async def add_chunks(
+        self,
+        document_id: int,
+        chunks: List[Dict[str, Any]],
+        session: Optional[AsyncSession] = None,
+    ) -> int:
+        """Add chunks for a document with one executemany INSERT."""
+        if not chunks:
+            return 0
+        
+        rows = [
+            {
+                "document_id": document_id,
+                "chunk_index": i,
+                "text": chunk_data["text"],
+                "start_char": chunk_data.get("start_char"),
+                "end_char": chunk_data.get("end_char"),
+                "page_number": chunk_data.get("page_number"),
+                "metadata_json": json.dumps(chunk_data.get("metadata", {})),
+                "embedding_id": chunk_data.get("embedding_id"),
+            }
+            for i, chunk_data in enumerate(chunks)
+        ]
+        
+        async with self._session_scope(session) as session:
+            await session.execute(insert(Chunk), rows)
+        
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(f"Added {len(chunks)} chunks for document {document_id}")
-            return chunk_objects
+        return len(rows)
     
     async def get_document(self, file_path: Path) -> Optional[Document]:
         """Get document by file path."""
@@ -142,13 +266,54 @@ class DocumentStore:
             result = await session.execute(stmt)
             return result.scalars().all()
     
+    async def get_embedding_ids(self, document_id: int) -> List[str]:
+        """Get a document's chunk embedding IDs from the covering index alone."""
+        async with self.async_session() as session:
+            stmt = (
+                select(Chunk.embedding_id)
+                .where(Chunk.document_id == document_id, Chunk.embedding_id.isnot(None))
+                .order_by(Chunk.chunk_index)
+            )
+            result = await session.execute(stmt)
+            return result.scalars().all()
+    
+    async def stream_chunks(self) -> AsyncIterator[Tuple[str, str]]:
+        """Yield (text, embedding_id) for every chunk from a single streamed query."""
+        async with self.async_session() as session:
+            stmt = select(Chunk.text, Chunk.embedding_id).order_by(Chunk.id)
+            result = await session.stream(stmt)
+            async for text, embedding_id in result:
+                yield text, embedding_id
+    
     async def get_chunk_by_embedding_id(self, embedding_id: str) -> Optional[Chunk]:
         """Get chunk by embedding ID."""
         async with self.async_session() as session:
             stmt = select(Chunk).where(Chunk.embedding_id == embedding_id)
             result = await session.execute(stmt)
             return result.scalars().first()
-
+    
+    async def get_chunks_with_docs(
+        self,
+        embedding_ids: List[str],
+    ) -> Dict[str, Tuple[Chunk, Document]]:
+        """Get chunks and their documents for many embedding IDs in one query."""
+        if not embedding_ids:
+            return {}
+        
+        async with self.async_session() as session:
+            stmt = (
+                select(Chunk, Document)
+                .join(Document, Chunk.document_id == Document.id)
+                .where(Chunk.embedding_id.in_(embedding_ids))
+                .order_by(Chunk.id)
+            )
+            result = await session.execute(stmt)
+            
+            rows = {}
+            for chunk, doc in result.all():
+                # Match get_chunk_by_embedding_id, which returns the first row
+                rows.setdefault(chunk.embedding_id, (chunk, doc))
+            return rows
     
     async def delete_document(self, file_path: Path) -> bool:
         """Delete a document and its chunks."""
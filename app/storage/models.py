@@ -1,18 +1,35 @@
 """SQLAlchemy database models."""
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from sqlalchemy import (
-    Column, String, Integer, Float, DateTime, Text, Boolean,
-    ForeignKey, Index, create_engine
+    Column, String, Integer, BigInteger, Float, DateTime, Text, Boolean,
+    ForeignKey, Index, create_engine, event
 )
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import relationship
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from pathlib import Path
 
 Base = declarative_base()
 
+# Page size of newly created databases; scripts/migrate_db.py rebuilds older files
+SQLITE_PAGE_SIZE = 8192
+
+# Applied to every new SQLite connection. WAL keeps readers off the writer's lock
+# and only fsyncs at checkpoints; it adds -wal/-shm files next to the database.
+# page_size must come first: it only takes effect before the file is written.
+SQLITE_PRAGMAS = (
+    f"PRAGMA page_size={SQLITE_PAGE_SIZE}",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
 
 class Document(Base):
     """Document metadata model."""
@@ -25,6 +42,9 @@ class Document(Base):
     file_size = Column(Integer, nullable=False)
     mime_type = Column(String(100))
     checksum = Column(String(64), nullable=False)
+    file_hash = Column(String(64))  # Hash of the raw file bytes, checked before parsing
+    mtime_ns = Column(BigInteger)  # File mtime and byte size when last seen; a match skips hashing
+    raw_size = Column(BigInteger)
     language = Column(String(10))
     title = Column(String(500))
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -37,6 +57,7 @@ class Document(Base):
     __table_args__ = (
         Index("idx_documents_path", "file_path"),
         Index("idx_documents_checksum", "checksum"),
+        Index("idx_documents_indexed_at", "indexed_at"),  # list_documents order
     )
 
 
@@ -59,7 +80,9 @@ class Chunk(Base):
     document = relationship("Document", back_populates="chunks")
     
     __table_args__ = (
-        Index("idx_chunks_document", "document_id"),
+        # Serves get_chunks' filter and ORDER BY chunk_index without a sort step, and
+        # covers get_embedding_ids so it never reads the table
+        Index("idx_chunks_doc_covering", "document_id", "chunk_index", "embedding_id"),
         Index("idx_chunks_embedding", "embedding_id"),
     )
 
@@ -98,12 +121,53 @@ class Citation(Base):
     # Relationships
     query = relationship("Query")
     chunk = relationship("Chunk")
+    
+    __table_args__ = (
+        Index("idx_citations_query", "query_id", "position"),
+    )
+
+
+def add_missing_columns(conn: Connection) -> List[str]:
+    """Add nullable model columns that an older database file lacks; returns what was added.
+    
+    Tables that don't exist yet are left to create_all.
+    """
+    added = []
+    for table in Base.metadata.sorted_tables:
+        existing = {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table.name})")}
+        if not existing:
+            continue
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                column_type = column.type.compile(dialect=conn.dialect)
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                )
+                added.append(f"{table.name}.{column.name}")
+    return added
 
 
 def get_engine(db_path: Path) -> AsyncEngine:
     """Create async database engine."""
-    return create_async_engine(
+    pool_kwargs = {}
+    if str(db_path) != ":memory:":
+        # Keep connections (and their PRAGMAs, page cache and mmap) open between sessions;
+        # under WAL, sessions on separate connections read concurrently
+        pool_kwargs = {"poolclass": AsyncAdaptedQueuePool, "pool_size": 4, "max_overflow": 4}
+    
+    engine = create_async_engine(
         f"sqlite+aiosqlite:///{db_path}",
         echo=False,
         future=True,
-    )
\ No newline at end of file
+        pool_pre_ping=False,
+        **pool_kwargs,
+    )
+    
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _connection_record):
+        cursor = dbapi_conn.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+    
+    return engine
\ No newline at end of file
@@ -1,16 +1,60 @@
 """FAISS vector store for similarity search."""
 
+import asyncio
+import logging
 import pickle
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
 import numpy as np
 import faiss
 
+from app.config import settings
 from app.core.embeddings import EmbeddingModel
+from app.storage.cache import SemanticCache
 from app.utils.logging import get_logger
+from app.utils.serialization import dumps, loads
 
 logger = get_logger(__name__)
 
+# HNSW graph degree and build-time beam width
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+# Training points per IVF list, as FAISS recommends
+IVF_POINTS_PER_LIST = 30
+# Vectors collected before an int8 scalar quantizer learns its per-dimension ranges
+SQ_TRAIN_VECTORS = 10_000
+
+# Scalar quantizer codes per precision; fp32 stores raw vectors
+_QTYPES = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+
+def _write_id_map(
+    path: Path,
+    faiss_ids: np.ndarray,
+    embedding_ids: List[str],
+    metadata: List[Dict[str, Any]],
+) -> None:
+    """Store the ID map as flat arrays: FAISS ids, embedding ids and JSON metadata."""
+    with open(path, "wb") as f:
+        np.savez(
+            f,
+            faiss_ids=np.asarray(faiss_ids, dtype="int64"),
+            embedding_ids=np.array(embedding_ids, dtype=str),
+            metadata=np.frombuffer(dumps(metadata), dtype=np.uint8),
+        )
+
+
+def _read_id_map(path: Path) -> Tuple[List[int], List[str], List[Dict[str, Any]]]:
+    """Load the FAISS ids, embedding ids and metadata written by _write_id_map."""
+    with np.load(path, allow_pickle=False) as data:
+        faiss_ids = data["faiss_ids"].tolist()
+        embedding_ids = data["embedding_ids"].tolist()
+        metadata = loads(data["metadata"].tobytes())
+    return faiss_ids, embedding_ids, metadata
+
 
 class VectorStore:
     """Manages FAISS index for vector similarity search."""
@@ -20,39 +64,189 @@ class VectorStore:
         self.embedding_model = embedding_model
         self.dimension = embedding_model.dimension
         self.index = None
-        self.id_map = {}  # Maps FAISS index to embedding IDs
+        # Embedding ID and metadata per FAISS ID (None once removed), so search
+        # results are gathered by indexing with the returned IDs
+        self._ids = np.empty(0, dtype=object)  # Grown by doubling; slots past next_id are unused
+        self._metas: List[Optional[Dict[str, Any]]] = []
+        self.next_id = 0  # Next FAISS ID; never reused so removals don't shift others
+        self.version = 0  # Bumped whenever the index contents change
         self.index_path = index_dir / "faiss.index"
-        self.id_map_path = index_dir / "id_map.pkl"
+        self.id_map_path = index_dir / "id_map.npz"
+        self.legacy_id_map_path = index_dir / "id_map.pkl"
+        # (query, top_k, threshold, cache key, future) waiting for the next batched search
+        self._pending_searches: List[Tuple[str, int, float, bytes, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self.query_cache = SemanticCache(
+            max_entries=settings.semantic_cache_size,
+            min_similarity=settings.semantic_cache_similarity,
+        )
     
     async def initialize(self):
         """Initialize or load the vector store."""
         self.index_dir.mkdir(parents=True, exist_ok=True)
         
-        if self.index_path.exists() and self.id_map_path.exists():
+        if self.index_path.exists() and (self.id_map_path.exists() or self.legacy_id_map_path.exists()):
             await self.load()
         else:
-            self.index = faiss.IndexFlatIP(self.dimension)  # Inner product for cosine similarity
-            self.id_map = {}
+            self.index = self._new_index()
+            self._set_ids([], [], [])
             logger.info("Created new FAISS index")
     
+    def _set_ids(
+        self,
+        faiss_ids: List[int],
+        embedding_ids: List[str],
+        metadata: List[Dict[str, Any]],
+    ) -> None:
+        """Replace the ID map with the given entries."""
+        self.next_id = max(faiss_ids, default=-1) + 1
+        self._ids = np.empty(self.next_id, dtype=object)
+        self._ids[faiss_ids] = embedding_ids
+        self._metas = [None] * self.next_id
+        for faiss_id, meta in zip(faiss_ids, metadata):
+            self._metas[faiss_id] = meta
+    
+    def _reserve_ids(self, count: int) -> None:
+        """Make room for count more IDs, doubling capacity like a list."""
+        needed = self.next_id + count
+        if needed > len(self._ids):
+            grown = np.empty(max(needed, 2 * len(self._ids)), dtype=object)
+            grown[:self.next_id] = self._ids[:self.next_id]
+            self._ids = grown
+    
+    def _needs_training(self) -> bool:
+        """Whether the configured index must see data before it can be built."""
+        return settings.vector_index_type == "ivf" or settings.vector_precision == "int8"
+    
+    def _target_index(self, nlist: int = 1) -> faiss.Index:
+        """Index of the configured type and precision, possibly still untrained."""
+        qtype = _QTYPES.get(settings.vector_precision)
+        metric = faiss.METRIC_INNER_PRODUCT
+        
+        if settings.vector_index_type == "ivf":
+            # IVF stores our IDs in its lists, so it needs no IndexIDMap2 wrapper
+            # (whose remove_ids assumes positions shift like a flat index)
+            quantizer = faiss.IndexFlatIP(self.dimension)
+            if qtype is None:
+                return faiss.IndexIVFFlat(quantizer, self.dimension, nlist, metric)
+            return faiss.IndexIVFScalarQuantizer(quantizer, self.dimension, nlist, qtype, metric)
+        
+        if settings.vector_index_type == "hnsw":
+            if qtype is None:
+                base = faiss.IndexHNSWFlat(self.dimension, HNSW_M, metric)
+            else:
+                base = faiss.IndexHNSWSQ(self.dimension, qtype, HNSW_M, metric)
+            base.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        elif qtype is None:
+            base = faiss.IndexFlatIP(self.dimension)
+        else:
+            base = faiss.IndexScalarQuantizer(self.dimension, qtype, metric)
+        return faiss.IndexIDMap2(base)
+    
+    def _new_index(self) -> faiss.Index:
+        """Empty inner-product index (cosine on normalized vectors) addressed by our own IDs.
+        
+        Indexes that need training start as a flat fp32 index; see _maybe_train.
+        """
+        if self._needs_training():
+            return faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+        return self._target_index()
+    
+    def _maybe_train(self) -> None:
+        """Move a large enough flat staging index to the trained configured index."""
+        threshold = (
+            settings.ivf_min_vectors if settings.vector_index_type == "ivf" else SQ_TRAIN_VECTORS
+        )
+        if (
+            not self._needs_training()
+            or self.index.ntotal < threshold
+            or not isinstance(self._base_index(), faiss.IndexFlat)
+        ):
+            return
+        
+        ntotal = self.index.ntotal
+        ids = faiss.vector_to_array(self.index.id_map).astype("int64")
+        vectors = self.index.index.reconstruct_n(0, ntotal)
+        
+        nlist = max(1, min(int(np.sqrt(ntotal)), ntotal // IVF_POINTS_PER_LIST))
+        index = self._target_index(nlist)
+        index.train(vectors)
+        if settings.vector_index_type == "ivf":
+            index.nprobe = min(nlist, max(8, nlist // 16))
+        
+        index.add_with_ids(vectors, ids)
+        self.index = index
+        logger.info(
+            f"Trained {settings.vector_index_type}/{settings.vector_precision} index on {ntotal} vectors"
+        )
+    
+    def _base_index(self) -> faiss.Index:
+        """The index doing the search, unwrapped from any IndexIDMap2."""
+        if isinstance(self.index, faiss.IndexIDMap2):
+            return faiss.downcast_index(self.index.index)
+        return self.index
+    
+    def _rebuild_without(self, remove: np.ndarray) -> None:
+        """Rebuild the index from every vector whose ID is not in remove."""
+        ids = faiss.vector_to_array(self.index.id_map).astype("int64")
+        keep = ids[~np.isin(ids, remove)]
+        index = self._new_index()
+        if len(keep):
+            index.add_with_ids(self.index.reconstruct_batch(keep), keep)
+        self.index = index
+        self._maybe_train()
+    
+    def _set_search_params(self, top_k: int) -> None:
+        """Widen the HNSW beam for larger result sets."""
+        base = self._base_index()
+        if isinstance(base, faiss.IndexHNSW):
+            base.hnsw.efSearch = max(top_k * 4, 64)
+    
     async def load(self):
         """Load index from disk."""
         try:
-            self.index = faiss.read_index(str(self.index_path))
-            with open(self.id_map_path, "rb") as f:
-                self.id_map = pickle.load(f)
+            index = faiss.read_index(str(self.index_path))
+            if self.id_map_path.exists():
+                faiss_ids, embedding_ids, metadata = _read_id_map(self.id_map_path)
+            else:
+                # Older snapshots pickle a {faiss_id: {"id", "metadata"}} dict
+                with open(self.legacy_id_map_path, "rb") as f:
+                    id_map = pickle.load(f)
+                faiss_ids = list(id_map)
+                embedding_ids = [item["id"] for item in id_map.values()]
+                metadata = [item.get("metadata", {}) for item in id_map.values()]
+            
+            if isinstance(index, faiss.IndexFlat):
+                # Older snapshots use a bare flat index keyed by position
+                wrapped = self._new_index()
+                if index.ntotal:
+                    wrapped.add_with_ids(
+                        index.reconstruct_n(0, index.ntotal),
+                        np.arange(index.ntotal, dtype="int64")
+                    )
+                index = wrapped
+            
+            self.index = index
+            self._set_ids(faiss_ids, embedding_ids, metadata)
             logger.info(f"Loaded FAISS index with {self.index.ntotal} vectors")
         except Exception as e:
             logger.error(f"Failed to load index: {e}")
-            self.index = faiss.IndexFlatIP(self.dimension)
-            self.id_map = {}
+            self.index = self._new_index()
+            self._set_ids([], [], [])
+        self.version += 1
     
     async def save(self):
         """Save index to disk."""
         try:
             faiss.write_index(self.index, str(self.index_path))
-            with open(self.id_map_path, "wb") as f:
-                pickle.dump(self.id_map, f)
+            live = np.flatnonzero(~np.equal(self._ids[:self.next_id], None))
+            _write_id_map(
+                self.id_map_path,
+                live,
+                self._ids[live].tolist(),
+                [self._metas[faiss_id] for faiss_id in live.tolist()],
+            )
+            self.legacy_id_map_path.unlink(missing_ok=True)
             logger.info(f"Saved FAISS index with {self.index.ntotal} vectors")
         except Exception as e:
             logger.error(f"Failed to save index: {e}")
@@ -68,24 +262,29 @@ class VectorStore:
             return
         
         # Generate embeddings
-        embeddings = await self.embedding_model.embed_batch(texts)
-        embeddings = np.array(embeddings).astype("float32")
+        embeddings = await self.embedding_model.embed_batch(texts, batch_size=settings.batch_size)
+        embeddings = np.asarray(embeddings, dtype="float32")
         
         # Normalize for cosine similarity
         faiss.normalize_L2(embeddings)
         
-        # Add to index
-        start_idx = self.index.ntotal
-        self.index.add(embeddings)
+        # Add to index under fresh IDs
+        count = len(embeddings)
+        start_id = self.next_id
+        self.index.add_with_ids(
+            embeddings, np.arange(start_id, start_id + count, dtype="int64")
+        )
         
         # Update ID map
-        for i, embedding_id in enumerate(embedding_ids):
-            self.id_map[start_idx + i] = {
-                "id": embedding_id,
-                "metadata": metadata[i] if metadata else {}
-            }
+        self._reserve_ids(count)
+        self._ids[start_id:start_id + count] = embedding_ids
+        self._metas.extend(metadata if metadata else [{}] * count)
+        self.next_id += count
+        self._maybe_train()
         
-        logger.debug(f"Added {len(texts)} embeddings to index")
+        self.version += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Added {len(texts)} embeddings to index")
     
     async def search(
         self,
@@ -97,58 +296,111 @@ class VectorStore:
         if self.index.ntotal == 0:
             return []
         
-        # Generate query embedding
-        query_embedding = await self.embedding_model.embed(query)
-        query_embedding = np.array([query_embedding]).astype("float32")
+        # Repeated queries skip embedding and search entirely
+        self.query_cache.sync(self.version)
+        params = (top_k, threshold)
+        cache_key = self.query_cache.make_key(query, params)
+        cached = self.query_cache.get_exact(cache_key)
+        if cached is not None:
+            return list(cached)
+        
+        # Concurrent searches are embedded and searched together
+        future = asyncio.get_running_loop().create_future()
+        self._pending_searches.append((query, top_k, threshold, cache_key, future))
+        if len(self._pending_searches) == 1:
+            self._flush_task = asyncio.create_task(self._flush_searches())
+        return list(await future)
+    
+    async def _flush_searches(self) -> None:
+        """Run every search queued during the batching window."""
+        await asyncio.sleep(settings.search_batch_window_ms / 1000)
+        batch, self._pending_searches = self._pending_searches, []
+        try:
+            await self._search_batch(batch)
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    async def _search_batch(self, batch: List[Tuple[str, int, float, bytes, asyncio.Future]]) -> None:
+        """Embed queued queries in one call and answer the uncached ones with one index search."""
+        query_embeddings = await self.embedding_model.embed_batch(
+            [query for query, *_ in batch], batch_size=settings.batch_size
+        )
+        query_embeddings = np.asarray(query_embeddings, dtype="float32").reshape(len(batch), -1)
         
         # Normalize for cosine similarity
-        faiss.normalize_L2(query_embedding)
+        faiss.normalize_L2(query_embeddings)
         
-        # Search
-        distances, indices = self.index.search(query_embedding, min(top_k, self.index.ntotal))
+        # Near-identical queries reuse a cached result
+        self.query_cache.sync(self.version)
+        rows = []
+        for row, (_, top_k, threshold, _, future) in enumerate(batch):
+            cached = self.query_cache.get_similar(query_embeddings[row], (top_k, threshold))
+            if cached is not None:
+                if not future.done():
+                    future.set_result(cached)
+            else:
+                rows.append(row)
         
-        results = []
-        for idx, distance in zip(indices[0], distances[0]):
-            if idx >= 0 and distance >= threshold:
-                item = self.id_map.get(idx)
-                if item:
-                    results.append((item["id"], float(distance), item.get("metadata", {})))
+        if not rows:
+            return
         
-        return results
+        # One search over all remaining queries, at the largest requested depth
+        k = min(max(batch[row][1] for row in rows), self.index.ntotal)
+        distances, indices = np.empty((len(rows), 0)), np.empty((len(rows), 0), dtype="int64")
+        if k > 0:
+            self._set_search_params(k)
+            distances, indices = self.index.search(query_embeddings[rows], k)
+        
+        for i, row in enumerate(rows):
+            _, top_k, threshold, cache_key, future = batch[row]
+            hits, scores = indices[i][:top_k], distances[i][:top_k]
+            mask = (hits >= 0) & (scores >= threshold)
+            hits = hits[mask]
+            results = [
+                (embedding_id, score, self._metas[faiss_id])
+                for embedding_id, score, faiss_id in zip(
+                    self._ids[hits].tolist(), scores[mask].tolist(), hits.tolist()
+                )
+                if embedding_id is not None
+            ]
+            
+            self.query_cache.put(cache_key, query_embeddings[row], (top_k, threshold), results)
+            if not future.done():
+                future.set_result(results)
     
     async def remove_embeddings(self, embedding_ids: List[str]) -> None:
         """Remove embeddings from the index."""
-        # Find indices to remove
-        indices_to_remove = []
-        for idx, item in self.id_map.items():
-            if item["id"] in embedding_ids:
-                indices_to_remove.append(idx)
+        # Find FAISS IDs to remove
+        wanted = set(embedding_ids)
+        live = self._ids[:self.next_id]
+        remove = np.flatnonzero(
+            np.fromiter((embedding_id in wanted for embedding_id in live), dtype=bool, count=len(live))
+        ).astype("int64")
         
-        if not indices_to_remove:
+        if not len(remove):
             return
         
-        # Rebuild index without removed items
-        new_index = faiss.IndexFlatIP(self.dimension)
-        new_id_map = {}
-        new_idx = 0
-        
-        for old_idx in range(self.index.ntotal):
-            if old_idx not in indices_to_remove:
-                vector = self.index.reconstruct(old_idx)
-                new_index.add(np.array([vector]))
-                if old_idx in self.id_map:
-                    new_id_map[new_idx] = self.id_map[old_idx]
-                new_idx += 1
-        
-        self.index = new_index
-        self.id_map = new_id_map
+        # One C-side pass over the index; remaining IDs are unchanged
+        try:
+            self.index.remove_ids(faiss.IDSelectorBatch(remove))
+        except RuntimeError:
+            # HNSW graphs can't drop nodes; rebuild from the vectors that remain
+            self._rebuild_without(remove)
+        self._ids[remove] = None
+        for faiss_id in remove.tolist():
+            self._metas[faiss_id] = None
+        self.version += 1
         
-        logger.debug(f"Removed {len(indices_to_remove)} embeddings from index")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Removed {len(remove)} embeddings from index")
     
     async def clear(self):
         """Clear the entire index."""
-        self.index = faiss.IndexFlatIP(self.dimension)
-        self.id_map = {}
+        self.index = self._new_index()
+        self._set_ids([], [], [])
+        self.version += 1
         logger.info("Cleared FAISS index")
     
     def get_stats(self) -> Dict[str, Any]:
@@ -3,6 +3,7 @@
 from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from pathlib import Path
 
 from app.dependencies import get_retriever, get_generator, get_document_store
@@ -13,8 +14,15 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
-# Setup templates
-templates = Jinja2Templates(directory="app/ui/templates")
+# Setup templates; compiled bytecode is kept on disk so restarts skip parsing
+_bytecode_dir = settings.index_dir.parent / "jinja_cache"
+_bytecode_dir.mkdir(parents=True, exist_ok=True)
+templates = Jinja2Templates(
+    directory="app/ui/templates",
+    bytecode_cache=FileSystemBytecodeCache(str(_bytecode_dir)),
+    auto_reload=False,
+    cache_size=400,
+)
 
 
 @router.get("/chat", response_class=HTMLResponse)
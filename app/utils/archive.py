@@ -0,0 +1,95 @@
+"""Tar.gz helpers for backup snapshots, using pigz when available."""
+
+import asyncio
+import io
+import shutil
+import subprocess
+import tarfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Detected once at import; pigz compresses on all cores
+PIGZ_PATH = shutil.which("pigz")
+TAR_PATH = shutil.which("tar")
+
+
+def _write_members(
+    tar: tarfile.TarFile,
+    members: Dict[str, Path],
+    extra_files: Optional[Dict[str, bytes]] = None,
+) -> None:
+    """Add files and in-memory entries to an open tar archive."""
+    for arcname, src in members.items():
+        tar.add(src, arcname=arcname)
+
+    for arcname, data in (extra_files or {}).items():
+        info = tarfile.TarInfo(arcname)
+        info.size = len(data)
+        info.mtime = int(time.time())
+        tar.addfile(info, io.BytesIO(data))
+
+
+def targz(
+    members: Dict[str, Path],
+    out_path: Path,
+    extra_files: Optional[Dict[str, bytes]] = None,
+    compresslevel: int = 6,
+) -> Path:
+    """Write a tar.gz archive of members (arcname -> path) plus in-memory extra files.
+
+    The tar stream is piped through pigz when installed, otherwise compressed
+    with Python's gzip.
+    """
+    if PIGZ_PATH:
+        with open(out_path, "wb") as out:
+            proc = subprocess.Popen(
+                [PIGZ_PATH, f"-{compresslevel}", "-c"],
+                stdin=subprocess.PIPE,
+                stdout=out,
+            )
+            try:
+                with tarfile.open(fileobj=proc.stdin, mode="w|") as tar:
+                    _write_members(tar, members, extra_files)
+            finally:
+                proc.stdin.close()
+                returncode = proc.wait()
+
+        if returncode != 0:
+            raise RuntimeError(f"pigz exited with status {returncode}")
+    else:
+        with tarfile.open(out_path, "w:gz", compresslevel=compresslevel) as tar:
+            _write_members(tar, members, extra_files)
+
+    return out_path
+
+
+async def async_targz(
+    members: Dict[str, Path],
+    out_path: Path,
+    extra_files: Optional[Dict[str, bytes]] = None,
+) -> Path:
+    """Create a tar.gz archive without blocking the event loop."""
+    return await asyncio.to_thread(targz, members, out_path, extra_files)
+
+
+async def async_untargz(archive_path: Path, dest_dir: Path) -> None:
+    """Extract a tar.gz archive into dest_dir, using tar + pigz when available."""
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    if PIGZ_PATH and TAR_PATH:
+        proc = await asyncio.create_subprocess_exec(
+            TAR_PATH,
+            f"--use-compress-program={PIGZ_PATH}",
+            "-xf", str(archive_path),
+            "-C", str(dest_dir),
+        )
+        if await proc.wait() == 0:
+            return
+        logger.warning("tar/pigz extraction failed, falling back to Python tarfile")
+
+    await asyncio.to_thread(shutil.unpack_archive, archive_path, dest_dir, "gztar")
@@ -0,0 +1,107 @@
+"""Fast file copy utilities using kernel-side copy primitives."""
+
+import errno
+import os
+import shutil
+from pathlib import Path
+
+# Errors that mean "this primitive is unavailable for these fds", not a real failure
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EBADF}
+
+SENDFILE_BLOCK_SIZE = 2 * 1024 * 1024  # 2 MiB
+READINTO_BLOCK_SIZE = 1024 * 1024  # 1 MiB
+
+
+def _copy_file_range(in_fd: int, out_fd: int, size: int) -> bool:
+    """Copy using copy_file_range. Returns False if unsupported before any data was copied."""
+    if not hasattr(os, "copy_file_range"):
+        return False
+
+    copied = 0
+    while copied < size:
+        try:
+            sent = os.copy_file_range(in_fd, out_fd, size - copied)
+        except OSError as e:
+            if copied == 0 and e.errno in _FALLBACK_ERRNOS:
+                return False
+            raise
+        if sent == 0:
+            break
+        copied += sent
+    return True
+
+
+def _sendfile(in_fd: int, out_fd: int, size: int) -> bool:
+    """Copy using sendfile. Returns False if unsupported before any data was copied."""
+    if not hasattr(os, "sendfile"):
+        return False
+
+    offset = 0
+    while offset < size:
+        try:
+            sent = os.sendfile(out_fd, in_fd, offset, min(SENDFILE_BLOCK_SIZE, size - offset))
+        except OSError as e:
+            if offset == 0 and e.errno in _FALLBACK_ERRNOS:
+                return False
+            raise
+        if sent == 0:
+            break
+        offset += sent
+    return True
+
+
+def _readinto_copy(in_fd: int, out_fd: int) -> None:
+    """Copy using a reused userspace buffer."""
+    buf = memoryview(bytearray(READINTO_BLOCK_SIZE))
+    with open(in_fd, "rb", buffering=0, closefd=False) as src, \
+         open(out_fd, "wb", buffering=0, closefd=False) as dst:
+        while True:
+            n = src.readinto(buf)
+            if not n:
+                break
+            dst.write(buf[:n])
+
+
+def fast_copy(src: Path, dst: Path) -> Path:
+    """Copy file contents and metadata from src to dst.
+
+    Tries copy_file_range (reflink on CoW filesystems), then sendfile, then a
+    1 MiB readinto loop. Metadata is copied like shutil.copy2.
+    """
+    src = Path(src)
+    dst = Path(dst)
+    if dst.is_dir():
+        dst = dst / src.name
+
+    in_fd = os.open(src, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+    try:
+        size = os.fstat(in_fd).st_size
+        out_fd = os.open(
+            dst,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0),
+            0o644,
+        )
+        try:
+            if not (_copy_file_range(in_fd, out_fd, size) or _sendfile(in_fd, out_fd, size)):
+                _readinto_copy(in_fd, out_fd)
+        finally:
+            os.close(out_fd)
+    finally:
+        os.close(in_fd)
+
+    shutil.copystat(src, dst)
+    return dst
+
+
+def fast_move(src: Path, dst: Path) -> Path:
+    """Rename src to dst, falling back to fast_copy + unlink across filesystems."""
+    src = Path(src)
+    dst = Path(dst)
+    try:
+        src.replace(dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        fast_copy(src, dst)
+        src.unlink()
+    return dst
@@ -0,0 +1,8 @@
+"""Hugging Face model cache helpers."""
+
+from huggingface_hub import try_to_load_from_cache
+
+
+def is_model_cached(model_name: str) -> bool:
+    """Whether a model is already in the local Hugging Face cache (no network check)."""
+    return isinstance(try_to_load_from_cache(repo_id=model_name, filename="config.json"), str)
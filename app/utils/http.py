@@ -0,0 +1,14 @@
+"""Shared HTTP client construction."""
+
+import importlib.util
+
+import httpx
+
+# HTTP/2 needs the h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def make_async_client(**kwargs) -> httpx.AsyncClient:
+    """AsyncClient that negotiates HTTP/2 whenever h2 is installed."""
+    kwargs.setdefault("http2", HTTP2_AVAILABLE)
+    return httpx.AsyncClient(**kwargs)
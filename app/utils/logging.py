@@ -7,27 +7,49 @@ from logging.handlers import RotatingFileHandler
 import re
 
 
+# All PII patterns in one alternation so each record is scanned once;
+# the matching group's name picks the replacement token
+_PII_PATTERN = re.compile(
+    r'(?P<EMAIL>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+    r'|(?P<PHONE>\b\d{3}[-.]?\d{3}[-.]?\d{4}\b)'
+    r'|(?P<SSN>\b\d{3}-\d{2}-\d{4}\b)'
+    r'|(?P<CC>\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b)'
+)
+
+
+# Every PII pattern needs an "@" or nine digits joined by single separators;
+# this cheap search rules out the full pattern for most messages
+_PII_HINT = re.compile(r'@|\d(?:[-.\s]?\d){8}')
+
+
+def _redact(match: re.Match) -> str:
+    """Replacement token for a PII match."""
+    return f"[{match.lastgroup}_REDACTED]"
+
+
+def _scrub(text: str) -> str:
+    """Redact potential PII from text."""
+    if not _PII_HINT.search(text):
+        return text
+    return _PII_PATTERN.sub(_redact, text)
+
+
 class PIIRedactingFormatter(logging.Formatter):
-    """Formatter that redacts potential PII from logs."""
+    """Formatter that redacts potential PII from logs.
+    
+    Only the message and any traceback are scanned; the timestamp, logger name
+    and level added by the format string never carry PII.
+    """
+    
+    def formatMessage(self, record):
+        record.message = _scrub(record.message)
+        return super().formatMessage(record)
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Patterns for PII detection
-        self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
-        self.phone_pattern = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
-        self.ssn_pattern = re.compile(r'\b\d{3}-\d{2}-\d{4}\b')
-        self.credit_card_pattern = re.compile(r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b')
+    def formatException(self, ei):
+        return _scrub(super().formatException(ei))
     
-    def format(self, record):
-        msg = super().format(record)
-        
-        # Redact potential PII
-        msg = self.email_pattern.sub('[EMAIL_REDACTED]', msg)
-        msg = self.phone_pattern.sub('[PHONE_REDACTED]', msg)
-        msg = self.ssn_pattern.sub('[SSN_REDACTED]', msg)
-        msg = self.credit_card_pattern.sub('[CC_REDACTED]', msg)
-        
-        return msg
+    def formatStack(self, stack_info):
+        return _scrub(super().formatStack(stack_info))
 
 
 def setup_logging(level: str = "INFO", log_file: Path = None):
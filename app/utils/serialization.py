@@ -0,0 +1,25 @@
+"""JSON encoding via orjson when installed, otherwise the standard library."""
+
+from typing import Any, Union
+
+try:
+    import orjson
+    
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        """Encode obj as UTF-8 JSON bytes, indented two spaces if asked."""
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    
+    loads = orjson.loads
+except ImportError:
+    import json
+    
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        """Encode obj as UTF-8 JSON bytes, indented two spaces if asked."""
+        return json.dumps(obj, indent=2 if indent else None).encode()
+    
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON bytes or text."""
+        return json.loads(data)
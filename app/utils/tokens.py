@@ -1,25 +1,92 @@
 """Token counting and management utilities."""
 
+import hashlib
+import os
+from collections import OrderedDict
+from functools import lru_cache
 import tiktoken
-from typing import List
+from typing import List, Optional, Tuple
 
+# Token counts of short texts (retrieved chunks, shared headers) are cached by
+# content digest; longer texts rarely repeat
+TOKEN_CACHE_SIZE = 8192
+TOKEN_CACHE_MAX_CHARS = 2048
+# Below this many texts, tiktoken's thread-pool fan-out costs more than it saves
+PARALLEL_BATCH_MIN = 64
 
-def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
-    """Count tokens in text."""
+_token_counts: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Encoding for a model, built once and reused."""
     try:
-        encoding = tiktoken.encoding_for_model(model)
+        return tiktoken.encoding_for_model(model)
     except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _cache_key(text: str, model: str) -> Tuple[str, bytes]:
+    """Key for a token count: the model and a digest of the text."""
+    return model, hashlib.blake2b(text.encode(), digest_size=16, usedforsecurity=False).digest()
+
+
+def _remember_count(key: Tuple[str, bytes], count: int) -> None:
+    """Store a token count, evicting the least recently used."""
+    _token_counts[key] = count
+    if len(_token_counts) > TOKEN_CACHE_SIZE:
+        _token_counts.popitem(last=False)
+
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """Count tokens in text."""
+    if len(text) > TOKEN_CACHE_MAX_CHARS:
+        return len(_get_encoding(model).encode(text))
     
-    return len(encoding.encode(text))
+    key = _cache_key(text, model)
+    count = _token_counts.get(key)
+    if count is None:
+        count = len(_get_encoding(model).encode(text))
+        _remember_count(key, count)
+    else:
+        _token_counts.move_to_end(key)
+    return count
+
+
+def count_tokens_batch(texts: List[str], model: str = "gpt-3.5-turbo") -> List[int]:
+    """Count tokens in many texts, encoding many uncached ones in parallel threads."""
+    counts: List[Optional[int]] = [None] * len(texts)
+    keys: List[Optional[Tuple[str, bytes]]] = [None] * len(texts)
+    misses = []
+    for i, text in enumerate(texts):
+        if len(text) <= TOKEN_CACHE_MAX_CHARS:
+            keys[i] = _cache_key(text, model)
+            counts[i] = _token_counts.get(keys[i])
+            if counts[i] is not None:
+                _token_counts.move_to_end(keys[i])
+                continue
+        misses.append(i)
+    
+    if misses:
+        encoding = _get_encoding(model)
+        if len(misses) >= PARALLEL_BATCH_MIN:
+            encoded = encoding.encode_batch(
+                [texts[i] for i in misses], num_threads=os.cpu_count() or 1
+            )
+            lengths = map(len, encoded)
+        else:
+            lengths = (len(encoding.encode(texts[i])) for i in misses)
+        for i, count in zip(misses, lengths):
+            counts[i] = count
+            if keys[i] is not None:
+                _remember_count(keys[i], counts[i])
+    
+    return counts
 
 
 def truncate_to_tokens(text: str, max_tokens: int, model: str = "gpt-3.5-turbo") -> str:
     """Truncate text to maximum token count."""
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")
+    encoding = _get_encoding(model)
     
     tokens = encoding.encode(text)
     
@@ -37,23 +104,22 @@ def split_by_tokens(
     model: str = "gpt-3.5-turbo"
 ) -> List[str]:
     """Split text into chunks by token count."""
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-    except KeyError:
-        encoding = tiktoken.get_encoding("cl100k_base")
+    encoding = _get_encoding(model)
     
     tokens = encoding.encode(text)
-    chunks = []
-    
-    start = 0
-    while start < len(tokens):
-        end = min(start + chunk_size, len(tokens))
-        chunk_tokens = tokens[start:end]
-        chunks.append(encoding.decode(chunk_tokens))
-        
-        if end >= len(tokens):
-            break
-        
-        start = end - overlap if overlap > 0 else end
-    
-    return chunks
\ No newline at end of file
+    n_tokens = len(tokens)
+    if not n_tokens:
+        return []
+    
+    step = chunk_size - max(overlap, 0)
+    if step <= 0:
+        raise ValueError("overlap must be smaller than chunk_size")
+    
+    # Windows stop at the first one that reaches the end of the text
+    last_start = max(n_tokens - chunk_size, 0)
+    slices = [tokens[start:start + chunk_size] for start in range(0, last_start + step, step)]
+    
+    # One native call decodes every window in parallel threads, when there are enough
+    if len(slices) >= PARALLEL_BATCH_MIN:
+        return encoding.decode_batch(slices, num_threads=os.cpu_count() or 1)
+    return [encoding.decode(window) for window in slices]
@@ -2,12 +2,38 @@
 
 import click
 import asyncio
-import httpx
+from rich import box
 from rich.console import Console
 from rich.table import Table
 
+from cli.utils import api_client
+
 console = Console()
 
+# Queries per /api/search/batch request; must match the max_length of
+# BatchSearchRequest.queries in app/api/search.py
+BATCH_MAX_QUERIES = 256
+
+
+def _results_table(query: str, results) -> Table:
+    """Results as a Rich table, with rows formatted up front and a plain box."""
+    rows = [
+        (f"{result['score']:.3f}", result['filename'], result['text'][:100] + "...")
+        for result in results
+    ]
+    table = Table(
+        title=f"Search Results for: {query}",
+        box=box.SIMPLE,
+        expand=False,
+        show_lines=False,
+    )
+    table.add_column("Score", style="cyan")
+    table.add_column("File", style="magenta")
+    table.add_column("Text", style="green")
+    for row in rows:
+        table.add_row(*row)
+    return table
+
 
 @click.group()
 def search():
@@ -20,24 +46,35 @@ def search():
 @click.option('--top-k', '-k', default=5, help='Number of results')
 async def query(query, top_k):
     """Search for documents."""
-    async with httpx.AsyncClient() as client:
+    async with api_client() as client:
         response = await client.get(
             "http://localhost:8000/api/search/",
             params={"q": query, "top_k": top_k}
         )
         if response.status_code == 200:
             data = response.json()
-            table = Table(title=f"Search Results for: {query}")
-            table.add_column("Score", style="cyan")
-            table.add_column("File", style="magenta")
-            table.add_column("Text", style="green")
-            
-            for result in data["results"]:
-                table.add_row(
-                    f"{result['score']:.3f}",
-                    result['filename'],
-                    result['text'][:100] + "..."
-                )
-            console.print(table)
+            console.print(_results_table(query, data["results"]))
         else:
-            console.print(f"[red]Search failed: {response.text}[/red]")
\ No newline at end of file
+            console.print(f"[red]Search failed: {response.text}[/red]")
+
+
+@search.command()
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--top-k', '-k', default=5, help='Number of results')
+async def query_file(path, top_k):
+    """Search for every query in a file, one per line, via the batch endpoint."""
+    with open(path, encoding="utf-8") as f:
+        queries = [line.strip() for line in f if line.strip()]
+    
+    async with api_client() as client:
+        for start in range(0, len(queries), BATCH_MAX_QUERIES):
+            response = await client.post(
+                "http://localhost:8000/api/search/batch",
+                json={"queries": queries[start:start + BATCH_MAX_QUERIES], "top_k": top_k}
+            )
+            if response.status_code != 200:
+                console.print(f"[red]Search failed: {response.text}[/red]")
+                return
+            
+            for data in response.json()["results"]:
+                console.print(_results_table(data["query"], data["results"]))
@@ -3,10 +3,22 @@
 import asyncio
 from functools import wraps
 
+import httpx
+
+from app.utils.http import make_async_client
+
 
 def async_command(f):
     """Decorator to run async commands."""
     @wraps(f)
     def wrapper(*args, **kwargs):
         return asyncio.run(f(*args, **kwargs))
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+
+def api_client(timeout: float = 30.0) -> httpx.AsyncClient:
+    """HTTP client for the API server, pooling (and over TLS, multiplexing) connections."""
+    return make_async_client(
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
@@ -1,8 +1,47 @@
 """Evaluation metrics."""
 
+from math import log2
 from typing import List, Dict, Any
 import numpy as np
 
+# NDCG rank discounts 1/log2(rank + 1) for ranks 1..4096
+_DISCOUNTS = 1.0 / np.log2(np.arange(2, 4098, dtype=np.float64))
+# Ideal DCG for 0..4096 relevant documents
+_CUMSUM_DISCOUNTS = np.concatenate([[0.0], np.cumsum(_DISCOUNTS)])
+
+
+def _discounts(k: int) -> np.ndarray:
+    """Discounts for ranks 1..k, from the table when it is long enough."""
+    if k <= len(_DISCOUNTS):
+        return _DISCOUNTS[:k]
+    return 1.0 / np.log2(np.arange(2, k + 2, dtype=np.float64))
+
+
+def _cumsum_discounts(k: int) -> np.ndarray:
+    """Ideal DCG for 0..k relevant documents, from the table when it is long enough."""
+    if k <= len(_DISCOUNTS):
+        return _CUMSUM_DISCOUNTS[:k + 1]
+    return np.concatenate([[0.0], np.cumsum(_discounts(k))])
+
+
+# Python floats for the per-query functions, which would otherwise pay NumPy scalar overhead
+_DISCOUNT_LIST = _DISCOUNTS.tolist()
+_CUMSUM_LIST = _CUMSUM_DISCOUNTS.tolist()
+
+
+def _discount(rank: int) -> float:
+    """Discount for a 1-based rank."""
+    if rank <= len(_DISCOUNT_LIST):
+        return _DISCOUNT_LIST[rank - 1]
+    return 1.0 / log2(rank + 1)
+
+
+def _idcg(n_ideal: int) -> float:
+    """Ideal DCG with n_ideal relevant documents at the top ranks."""
+    if n_ideal < len(_CUMSUM_LIST):
+        return _CUMSUM_LIST[n_ideal]
+    return float(_discounts(n_ideal).sum())
+
 
 def precision_at_k(relevant: List[str], retrieved: List[str], k: int) -> float:
     """Calculate precision@k."""
@@ -48,15 +87,67 @@ def ndcg_at_k(relevant: List[str], retrieved: List[str], k: int) -> float:
     relevant_set = set(relevant)
     
     # Calculate DCG
-    dcg = 0.0
-    for i, doc in enumerate(retrieved_k, 1):
-        if doc in relevant_set:
-            dcg += 1.0 / np.log2(i + 1)
+    dcg = sum(_discount(i) for i, doc in enumerate(retrieved_k, 1) if doc in relevant_set)
     
     # Calculate IDCG
-    idcg = sum(1.0 / np.log2(i + 2) for i in range(min(len(relevant), k)))
+    idcg = _idcg(min(len(relevant), k))
     
     if idcg == 0:
         return 0.0
     
-    return dcg / idcg
\ No newline at end of file
+    return dcg / idcg
+
+
+def compute_metrics_batch(
+    relevant: List[List[str]],
+    retrieved: List[List[str]],
+    k: int,
+) -> Dict[str, np.ndarray]:
+    """Per-query precision@k, recall@k, MRR and NDCG@k for many queries at once.
+    
+    Document names are mapped to integer ids once, and hits for every query are
+    found with a single np.isin over (query, id) keys; the metrics are then
+    whole-matrix reductions. MRR only looks at the first k results.
+    """
+    n = len(retrieved)
+    ids: Dict[str, int] = {}
+    
+    # Retrieved ids as an (n, k) matrix padded with -1
+    retrieved_ids = np.full((n, k), -1, dtype=np.int64)
+    for row, docs in enumerate(retrieved):
+        docs = docs[:k]
+        retrieved_ids[row, :len(docs)] = [ids.setdefault(doc, len(ids)) for doc in docs]
+    
+    # Relevant ids flattened CSR-style, with their query row
+    n_relevant = np.fromiter(map(len, relevant), dtype=np.int64, count=n)
+    relevant_rows = np.repeat(np.arange(n, dtype=np.int64), n_relevant)
+    relevant_ids = np.fromiter(
+        (ids.setdefault(doc, len(ids)) for docs in relevant for doc in docs),
+        dtype=np.int64,
+        count=int(n_relevant.sum()),
+    )
+    
+    # One key per (query, document); width exceeds every id so keys never collide
+    width = len(ids) + 1
+    hits = (retrieved_ids >= 0) & np.isin(
+        np.arange(n, dtype=np.int64)[:, None] * width + retrieved_ids,
+        relevant_rows * width + relevant_ids,
+    )
+    
+    hit_counts = hits.sum(axis=1)
+    n_retrieved = (retrieved_ids >= 0).sum(axis=1)
+    discounts = _discounts(k)
+    ideal = _cumsum_discounts(k)[np.minimum(n_relevant, k)]
+    
+    return {
+        "precision_at_k": np.divide(
+            hit_counts, n_retrieved, out=np.zeros(n), where=n_retrieved > 0
+        ),
+        "recall_at_k": np.divide(
+            hit_counts, n_relevant, out=np.zeros(n), where=n_relevant > 0
+        ),
+        "mrr": np.where(hits.any(axis=1), 1.0 / (hits.argmax(axis=1) + 1), 0.0),
+        "ndcg_at_k": np.divide(
+            hits @ discounts, ideal, out=np.zeros(n), where=(ideal > 0) & (n_retrieved > 0)
+        ),
+    }
@@ -1,26 +1,27 @@
 """Evaluation reporting."""
 
-import json
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any
 
+from app.utils.serialization import dumps
+
 
 def generate_report(results: Dict[str, float], output_path: Path = None) -> str:
     """Generate evaluation report."""
-    report = []
-    report.append("=" * 50)
-    report.append("RAG EVALUATION REPORT")
-    report.append(f"Generated: {datetime.now().isoformat()}")
-    report.append("=" * 50)
-    report.append("")
-    
-    report.append("RETRIEVAL METRICS:")
-    report.append("-" * 20)
-    for metric, value in results.items():
-        report.append(f"  {metric:20s}: {value:.3f}")
-    
-    report_text = "\n".join(report)
+    rule = "=" * 50
+    header = (
+        f"{rule}\n"
+        f"RAG EVALUATION REPORT\n"
+        f"Generated: {datetime.now().isoformat()}\n"
+        f"{rule}\n"
+        f"\n"
+        f"RETRIEVAL METRICS:\n"
+        f"{'-' * 20}"
+    )
+    report_text = "\n".join(
+        (header, *(f"  {metric:20s}: {value:.3f}" for metric, value in results.items()))
+    )
     
     if output_path:
         output_path.write_text(report_text)
@@ -35,5 +36,4 @@ def save_json_report(results: Dict[str, Any], output_path: Path):
         "metrics": results
     }
     
-    with open(output_path, "w") as f:
-        json.dump(report_data, f, indent=2)
\ No newline at end of file
+    output_path.write_bytes(dumps(report_data, indent=True))
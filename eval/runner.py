@@ -5,53 +5,121 @@ import asyncio
 from pathlib import Path
 from typing import List, Dict, Any
 import httpx
-from eval.metrics import precision_at_k, recall_at_k, mean_reciprocal_rank, ndcg_at_k
 
+from app.utils.http import make_async_client
+from eval.metrics import compute_metrics_batch
 
-async def run_evaluation(dataset_path: Path, top_k: int = 5) -> Dict[str, float]:
-    """Run evaluation on a dataset."""
+# TaskGroup (3.11+) cancels the other batches as soon as one fails
+_TASKGROUP_AVAILABLE = hasattr(asyncio, "TaskGroup")
+
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5  # Seconds, doubled after each failed attempt
+
+
+async def _search_batch(
+    client: httpx.AsyncClient,
+    questions: List[str],
+    top_k: int,
+) -> List[Dict[str, Any]]:
+    """Search a batch of questions, retrying transport errors and 5xx responses with backoff."""
+    url = "http://localhost:8000/api/search/batch"
+    payload = {"queries": questions, "top_k": top_k}
+    for attempt in range(RETRY_ATTEMPTS - 1):
+        try:
+            response = await client.post(url, json=payload)
+        except httpx.TransportError:
+            pass
+        else:
+            if response.status_code < 500:
+                response.raise_for_status()
+                return response.json()["results"]
+        await asyncio.sleep(RETRY_BASE_DELAY * 2 ** attempt)
+    
+    # Last attempt: any error propagates
+    response = await client.post(url, json=payload)
+    response.raise_for_status()
+    return response.json()["results"]
+
+
+async def _run_batch(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    questions: List[str],
+    top_k: int,
+    start: int,
+    results: Dict[int, List[Dict[str, Any]]],
+) -> None:
+    """Search the batch of questions starting at index start and store its results there."""
+    async with semaphore:
+        results[start] = await _search_batch(client, questions, top_k)
+
+
+async def run_evaluation(
+    dataset_path: Path,
+    top_k: int = 5,
+    concurrency: int = 16,
+    batch_size: int = 64,
+) -> Dict[str, float]:
+    """Run evaluation on a dataset.
+    
+    Questions go to the batch search endpoint batch_size at a time, with up to
+    concurrency requests in flight. A batch that still fails after retries
+    raises, cancelling the rest, rather than being left out of the metrics.
+    """
     with open(dataset_path) as f:
         dataset = json.load(f)
     
-    results = {
-        "precision_at_k": [],
-        "recall_at_k": [],
-        "mrr": [],
-        "ndcg_at_k": []
-    }
+    # Repeated questions are searched once and their results shared
+    questions = list(dict.fromkeys(query_item["question"] for query_item in dataset["queries"]))
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    
+    batches: Dict[int, List[Dict[str, Any]]] = {}
+    starts = range(0, len(questions), batch_size)
+    
+    async with make_async_client(timeout=30.0, limits=limits) as client:
+        if _TASKGROUP_AVAILABLE:
+            async with asyncio.TaskGroup() as tg:
+                for start in starts:
+                    tg.create_task(_run_batch(
+                        client, semaphore, questions[start:start + batch_size], top_k, start, batches
+                    ))
+        else:
+            await asyncio.gather(*(
+                _run_batch(client, semaphore, questions[start:start + batch_size], top_k, start, batches)
+                for start in starts
+            ))
+    responses = dict(zip(questions, (data for start in starts for data in batches[start])))
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for query_item in dataset["queries"]:
-            # Search
-            response = await client.get(
-                "http://localhost:8000/api/search/",
-                params={"q": query_item["question"], "top_k": top_k}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                retrieved = [r["filename"] for r in data["results"]]
-                relevant = query_item["relevant_docs"]
-                
-                # Calculate metrics
-                results["precision_at_k"].append(precision_at_k(relevant, retrieved, top_k))
-                results["recall_at_k"].append(recall_at_k(relevant, retrieved, top_k))
-                results["mrr"].append(mean_reciprocal_rank(relevant, retrieved))
-                results["ndcg_at_k"].append(ndcg_at_k(relevant, retrieved, top_k))
-    
-    # Average metrics
+    relevant_lists = []
+    retrieved_lists = []
+    for query_item in dataset["queries"]:
+        retrieved_lists.append([r["filename"] for r in responses[query_item["question"]]["results"]])
+        relevant_lists.append(query_item["relevant_docs"])
+    
+    # Calculate metrics for every query at once, then average
+    results = compute_metrics_batch(relevant_lists, retrieved_lists, top_k)
     return {
-        metric: sum(values) / len(values) if values else 0.0
+        metric: float(values.mean()) if len(values) else 0.0
         for metric, values in results.items()
     }
 
 
 if __name__ == "__main__":
-    import sys
-    dataset_path = Path(sys.argv[1] if len(sys.argv) > 1 else "eval/datasets/sample_qa.json")
-    results = asyncio.run(run_evaluation(dataset_path))
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Run retrieval evaluation")
+    parser.add_argument("dataset", nargs="?", type=Path, default=Path("eval/datasets/sample_qa.json"))
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once")
+    parser.add_argument("--batch-size", type=int, default=64, help="Questions per batch request")
+    args = parser.parse_args()
+    
+    results = asyncio.run(
+        run_evaluation(args.dataset, args.top_k, args.concurrency, args.batch_size)
+    )
     
     print("Evaluation Results:")
     print("-" * 40)
     for metric, value in results.items():
-        print(f"{metric}: {value:.3f}")
\ No newline at end of file
+        print(f"{metric}: {value:.3f}")
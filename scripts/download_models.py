@@ -10,6 +10,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sentence_transformers import SentenceTransformer, CrossEncoder
 from app.config import settings
+from app.utils.hf_cache import is_model_cached
 
 
 def download_models():
@@ -17,13 +18,19 @@ def download_models():
     print("📥 Downloading models...")
     
     # Download embedding model
-    print(f"  • Downloading embedding model: {settings.model_name}")
-    _ = SentenceTransformer(settings.model_name)
+    if is_model_cached(settings.model_name):
+        print(f"  • Embedding model already cached: {settings.model_name}")
+    else:
+        print(f"  • Downloading embedding model: {settings.model_name}")
+        _ = SentenceTransformer(settings.model_name)
     
     # Download reranker model if not in offline mode
     if not settings.offline_mode and settings.reranker_model:
-        print(f"  • Downloading reranker model: {settings.reranker_model}")
-        _ = CrossEncoder(settings.reranker_model)
+        if is_model_cached(settings.reranker_model):
+            print(f"  • Reranker model already cached: {settings.reranker_model}")
+        else:
+            print(f"  • Downloading reranker model: {settings.reranker_model}")
+            _ = CrossEncoder(settings.reranker_model)
     
     print("✅ Models downloaded successfully!")
 
@@ -1,7 +1,15 @@
 #!/usr/bin/env python3
 """Pre-download required models for offline use - simplified version."""
 
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
 from sentence_transformers import SentenceTransformer, CrossEncoder
+from app.utils.hf_cache import is_model_cached
+
 
 def download_models():
     """Download and cache all required models."""
@@ -9,13 +17,19 @@ def download_models():
     
     # Download embedding model
     model_name = "sentence-transformers/all-MiniLM-L6-v2"
-    print(f"  • Downloading embedding model: {model_name}")
-    _ = SentenceTransformer(model_name)
+    if is_model_cached(model_name):
+        print(f"  • Embedding model already cached: {model_name}")
+    else:
+        print(f"  • Downloading embedding model: {model_name}")
+        _ = SentenceTransformer(model_name)
     
     # Download reranker model
     reranker_model = "cross-encoder/ms-marco-MiniLM-L-6-v2"
-    print(f"  • Downloading reranker model: {reranker_model}")
-    _ = CrossEncoder(reranker_model)
+    if is_model_cached(reranker_model):
+        print(f"  • Reranker model already cached: {reranker_model}")
+    else:
+        print(f"  • Downloading reranker model: {reranker_model}")
+        _ = CrossEncoder(reranker_model)
     
     print("✅ Models downloaded successfully!")
 
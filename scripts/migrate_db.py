@@ -9,7 +9,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import text
-from app.storage.models import Base, get_engine
+from app.storage.models import Base, SQLITE_PAGE_SIZE, add_missing_columns, get_engine
 from app.config import settings
 from app.utils.logging import get_logger
 
@@ -24,6 +24,9 @@ async def create_tables():
         # Create tables
         await conn.run_sync(Base.metadata.create_all)
         
+        # Add columns introduced after the table was first created
+        await conn.run_sync(add_missing_columns)
+        
         # Create indexes for better performance
         await conn.execute(text("""
             CREATE INDEX IF NOT EXISTS idx_documents_path ON documents(file_path);
@@ -32,20 +35,55 @@ async def create_tables():
             CREATE INDEX IF NOT EXISTS idx_documents_checksum ON documents(checksum);
         """))
         await conn.execute(text("""
-            CREATE INDEX IF NOT EXISTS idx_chunks_document ON chunks(document_id);
+            CREATE INDEX IF NOT EXISTS idx_documents_indexed_at ON documents(indexed_at);
+        """))
+        # Ordered chunk fetches per document, covering embedding_id lookups;
+        # supersedes the earlier document_id indexes
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_chunks_doc_covering
+            ON chunks(document_id, chunk_index, embedding_id);
         """))
+        await conn.execute(text("DROP INDEX IF EXISTS idx_chunks_document"))
+        await conn.execute(text("DROP INDEX IF EXISTS idx_chunks_doc_idx"))
         await conn.execute(text("""
             CREATE INDEX IF NOT EXISTS idx_queries_timestamp ON queries(timestamp);
         """))
+        await conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS idx_citations_query ON citations(query_id, position);
+        """))
         
     await engine.dispose()
     logger.info("Database tables created successfully")
 
 
+async def tune_database():
+    """Rebuild the database file with the configured page size if it differs.
+    
+    Connection-level PRAGMAs (WAL, synchronous, cache, mmap) are applied by
+    get_engine; page size is fixed in the file and needs a VACUUM to change.
+    """
+    engine = get_engine(settings.sqlite_path)
+    
+    async with engine.connect() as conn:
+        # VACUUM and journal mode changes can't run inside a transaction
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        page_size = (await conn.execute(text("PRAGMA page_size"))).scalar()
+        if page_size != SQLITE_PAGE_SIZE:
+            # A WAL database keeps its page size; leave WAL for the rebuild
+            await conn.execute(text("PRAGMA journal_mode=DELETE"))
+            await conn.execute(text(f"PRAGMA page_size={SQLITE_PAGE_SIZE}"))
+            await conn.execute(text("VACUUM"))
+            await conn.execute(text("PRAGMA journal_mode=WAL"))
+            logger.info(f"Rebuilt database with page size {SQLITE_PAGE_SIZE} (was {page_size})")
+    
+    await engine.dispose()
+
+
 async def main():
     """Run migrations."""
     print("🔧 Running database migrations...")
     await create_tables()
+    await tune_database()
     print("✅ Database migrations complete!")
 
 
@@ -1,9 +1,11 @@
 """Pytest fixtures."""
 
+import sys
+
 import pytest
 import tempfile
 from pathlib import Path
-from app.config import Settings
+from app.config import Settings, settings
 
 
 @pytest.fixture
@@ -13,6 +15,14 @@ def temp_dir():
         yield Path(tmpdir)
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(monkeypatch, tmp_path):
+    """Keep the query cache, which lives next to the index, out of ./var."""
+    monkeypatch.setattr(settings, "index_dir", tmp_path / "index")
+    if "app.dependencies" in sys.modules:
+        monkeypatch.setattr(sys.modules["app.dependencies"], "_query_cache", None)
+
+
 @pytest.fixture
 def test_settings(temp_dir):
     """Create test settings."""
@@ -21,4 +31,4 @@ def test_settings(temp_dir):
         index_dir=temp_dir / "index",
         sqlite_path=temp_dir / "test.db",
         offline_mode=True,
-    )
\ No newline at end of file
+    )
@@ -39,4 +39,62 @@ def test_search_endpoint(client):
         
         response = client.get("/api/search/", params={"q": "test", "top_k": 5})
         assert response.status_code == 200
-        assert "results" in response.json()
\ No newline at end of file
+        assert "results" in response.json()
+
+
+def test_search_etag_not_modified():
+    """Test repeated searches with a matching ETag return 304 without searching."""
+    from app.main import app
+    from app.api import search as search_api
+    
+    retriever = Mock()
+    retriever.index_version = "1.1"
+    retriever.search = AsyncMock(return_value=[])
+    app.dependency_overrides[search_api.get_retriever] = lambda: retriever
+    
+    try:
+        client = TestClient(app)
+        first = client.get("/api/search/", params={"q": "test", "top_k": 5})
+        assert first.status_code == 200
+        
+        second = client.get(
+            "/api/search/",
+            params={"q": "test", "top_k": 5},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+        assert second.status_code == 304
+        assert retriever.search.await_count == 1
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_search_batch_endpoint():
+    """Test batch search returns one response per query, in order."""
+    from app.main import app
+    from app.api import search as search_api
+    
+    retriever = Mock()
+    retriever.search = AsyncMock(side_effect=lambda query, top_k, use_reranker: [{
+        "chunk_id": 1,
+        "document_id": 1,
+        "text": query,
+        "score": 0.5,
+        "file_path": "/data/a.txt",
+        "filename": "a.txt",
+        "page_number": None,
+    }])
+    app.dependency_overrides[search_api.get_retriever] = lambda: retriever
+    
+    try:
+        client = TestClient(app)
+        response = client.post("/api/search/batch", json={"queries": ["one", "two"], "top_k": 3})
+        assert response.status_code == 200
+        
+        results = response.json()["results"]
+        assert [r["query"] for r in results] == ["one", "two"]
+        assert [r["results"][0]["text"] for r in results] == ["one", "two"]
+        assert retriever.search.await_count == 2
+        
+        assert client.post("/api/search/batch", json={"queries": []}).status_code == 422
+    finally:
+        app.dependency_overrides.clear()
@@ -3,7 +3,7 @@
 import pytest
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, AsyncMock
+from unittest.mock import Mock, AsyncMock, MagicMock
 from app.ingest.pipeline import IngestionPipeline
 
 
@@ -16,6 +16,7 @@ async def test_ingest_text_file():
     
     try:
         mock_doc_store = Mock()
+        mock_doc_store.ingest_session = MagicMock()
         mock_doc_store.get_document = AsyncMock(return_value=None)
         mock_doc_store.add_document = AsyncMock(return_value=Mock(id=1))
         mock_doc_store.add_chunks = AsyncMock(return_value=[])
@@ -40,4 +41,45 @@ async def test_ingest_text_file():
         assert mock_doc_store.add_document.called
         assert mock_vector_store.add_embeddings.called
     finally:
-        temp_path.unlink()
\ No newline at end of file
+        temp_path.unlink()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_leaves_documents_pending(temp_dir):
+    """Test a failed deferred flush is reported and the file is ingested again next scan."""
+    from app.storage.document_store import DocumentStore
+    from app.storage.models import Base
+    
+    docs_dir = temp_dir / "docs"
+    docs_dir.mkdir()
+    (docs_dir / "a.txt").write_text("Cats are small domestic animals. " * 20)
+    
+    document_store = DocumentStore(temp_dir / "test.db")
+    await document_store.initialize()
+    async with document_store.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    mock_vector_store = Mock()
+    mock_vector_store.add_embeddings = AsyncMock(side_effect=RuntimeError("embedding failed"))
+    mock_vector_store.save = AsyncMock()
+    
+    pipeline = IngestionPipeline(
+        document_store=document_store,
+        vector_store=mock_vector_store,
+        embedding_model=Mock()
+    )
+    
+    try:
+        results = await pipeline.ingest_directory(docs_dir)
+        assert results["failed"] == 1
+        assert results["error"] == "embedding failed"
+        
+        mock_vector_store.add_embeddings = AsyncMock()
+        results = await pipeline.ingest_directory(docs_dir)
+        assert results["success"] == 1
+        assert mock_vector_store.add_embeddings.called
+        
+        results = await pipeline.ingest_directory(docs_dir)
+        assert results["files"][0]["status"] == "unchanged"
+    finally:
+        await document_store.close()
@@ -0,0 +1,57 @@
+"""Test query cache."""
+
+import pytest
+
+from app.storage import cache as cache_module
+from app.storage.cache import QueryCache
+
+
+@pytest.mark.asyncio
+async def test_query_cache_persists_across_instances(temp_dir):
+    """Test cached results are served from SQLite after a restart."""
+    cache = QueryCache(temp_dir, ttl_seconds=60)
+    await cache.set("What is RAG?", "hybrid", 5, {"results": [1, 2]})
+    
+    assert await cache.get("  what is rag?  ", "hybrid", 5) == {"results": [1, 2]}
+    assert await cache.get("What is RAG?", "vector", 5) is None
+    cache.close()
+    
+    reopened = QueryCache(temp_dir, ttl_seconds=60)
+    assert await reopened.get("What is RAG?", "hybrid", 5) == {"results": [1, 2]}
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_query_cache_expires_entries(temp_dir, monkeypatch):
+    """Test entries older than the TTL are neither served nor kept."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    
+    cache = QueryCache(temp_dir, ttl_seconds=60)
+    await cache.set("old", "hybrid", 5, {"n": 1})
+    now[0] += 61
+    assert await cache.get("old", "hybrid", 5) is None
+    
+    # The next write deletes expired rows
+    await cache.set("new", "hybrid", 5, {"n": 2})
+    rows = cache._conn.execute("SELECT COUNT(*) FROM query_cache").fetchone()[0]
+    assert rows == 1
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_query_cache_memory_lru(temp_dir):
+    """Test the in-memory front evicts least recently used entries but SQLite keeps them."""
+    cache = QueryCache(temp_dir, ttl_seconds=60, memory_size=2)
+    await cache.set("a", "hybrid", 5, {"n": "a"})
+    await cache.set("b", "hybrid", 5, {"n": "b"})
+    await cache.get("a", "hybrid", 5)
+    await cache.set("c", "hybrid", 5, {"n": "c"})
+    
+    key = cache._get_cache_key
+    assert list(cache._memory) == [key("a", "hybrid", 5), key("c", "hybrid", 5)]
+    assert await cache.get("b", "hybrid", 5) == {"n": "b"}
+    
+    await cache.clear()
+    assert await cache.get("a", "hybrid", 5) is None
+    cache.close()
@@ -32,4 +32,38 @@ def test_chunk_by_sentences():
     
     assert len(chunks) > 0
     for chunk in chunks:
-        assert chunk["text"].endswith(('.', '!', '?')) or chunk == chunks[-1]
\ No newline at end of file
+        assert chunk["text"].endswith(('.', '!', '?')) or chunk == chunks[-1]
+
+
+def test_chunk_by_sentences_overlap():
+    """Test sentence chunks respect size and carry trailing sentences as overlap."""
+    chunker = TextChunker(ChunkConfig(
+        chunk_size=120,
+        chunk_overlap=30,
+        respect_sentence_boundary=True
+    ))
+    
+    text = " ".join(f"Sentence number {i} has some words." for i in range(40))
+    chunks = chunker.chunk_text(text)
+    
+    assert len(chunks) > 1
+    for prev, curr in zip(chunks, chunks[1:]):
+        last_sentence = prev["text"].rsplit(" Sentence", 1)[-1]
+        assert last_sentence in curr["text"]
+
+
+def test_chunk_by_size_no_duplicate_windows():
+    """Test size-based chunking always advances, even when overlap exceeds the window."""
+    chunker = TextChunker(ChunkConfig(
+        chunk_size=120,
+        chunk_overlap=200,
+        min_chunk_size=10,
+        respect_sentence_boundary=False
+    ))
+    
+    text = "word " * 200
+    chunks = chunker.chunk_text(text)
+    
+    starts = [c["start_char"] for c in chunks]
+    assert len(chunks) > 1
+    assert starts == sorted(set(starts))
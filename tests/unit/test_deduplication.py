@@ -31,6 +31,15 @@ def test_fuzzy_duplicate_detection():
     # Second might be detected as similar depending on threshold
 
 
+def test_fuzzy_duplicate_repeated_text():
+    """Test that repeated text is flagged and distinct texts are all indexed."""
+    dedup = Deduplicator()
+    
+    assert dedup.is_duplicate_fuzzy("alpha beta gamma delta") == (False, 0.0)
+    assert dedup.is_duplicate_fuzzy("epsilon zeta eta theta") == (False, 0.0)
+    assert dedup.is_duplicate_fuzzy("alpha beta gamma delta")[0]
+
+
 def test_chunk_deduplication():
     """Test chunk deduplication."""
     dedup = Deduplicator()
@@ -0,0 +1,42 @@
+"""Test document store."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from app.storage.document_store import DocumentStore
+
+
+@pytest.mark.asyncio
+async def test_initialize_backfills_file_state_columns(temp_dir):
+    """Test a database from before file_hash/mtime_ns/raw_size opens and gains the columns."""
+    db_path = temp_dir / "rag.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE documents (id INTEGER PRIMARY KEY, file_path VARCHAR(500) UNIQUE NOT NULL, "
+        "filename VARCHAR(255) NOT NULL, file_size INTEGER NOT NULL, mime_type VARCHAR(100), "
+        "checksum VARCHAR(64) NOT NULL, language VARCHAR(10), title VARCHAR(500), "
+        "created_at DATETIME, modified_at DATETIME, indexed_at DATETIME)"
+    )
+    conn.execute(
+        "INSERT INTO documents (file_path, filename, file_size, checksum) "
+        "VALUES ('notes.md', 'notes.md', 10, 'abc')"
+    )
+    conn.commit()
+    conn.close()
+    
+    store = DocumentStore(db_path)
+    await store.initialize()
+    try:
+        doc = await store.get_document(Path("notes.md"))
+        assert doc.checksum == "abc"
+        assert doc.file_hash is None
+        assert doc.mtime_ns is None
+        assert doc.raw_size is None
+    finally:
+        await store.close()
+    
+    with sqlite3.connect(db_path) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(documents)")}
+    assert {"file_hash", "mtime_ns", "raw_size"} <= columns
@@ -5,6 +5,12 @@ from unittest.mock import Mock, AsyncMock
 from app.core.retrieval import HybridRetriever
 
 
+async def _no_chunks():
+    """Empty async chunk stream."""
+    return
+    yield
+
+
 @pytest.mark.asyncio
 async def test_hybrid_retriever_initialization():
     """Test retriever initialization."""
@@ -16,7 +22,7 @@ async def test_hybrid_retriever_initialization():
         document_store=mock_document_store
     )
     
-    mock_document_store.list_documents = AsyncMock(return_value=[])
+    mock_document_store.stream_chunks = _no_chunks
     await retriever.initialize()
     
     assert retriever.vector_store == mock_vector_store
@@ -30,7 +36,7 @@ async def test_search_empty_index():
     mock_vector_store.search = AsyncMock(return_value=[])
     
     mock_document_store = Mock()
-    mock_document_store.list_documents = AsyncMock(return_value=[])
+    mock_document_store.stream_chunks = _no_chunks
     
     retriever = HybridRetriever(
         vector_store=mock_vector_store,
@@ -40,4 +46,17 @@ async def test_search_empty_index():
     await retriever.initialize()
     results = await retriever.search("test query", top_k=5)
     
-    assert results == []
\ No newline at end of file
+    assert results == []
+
+
+def test_fuse_scores():
+    """Test weighted score fusion across vector and BM25 results."""
+    retriever = HybridRetriever(vector_store=Mock(), document_store=Mock())
+    
+    fused = retriever._fuse_scores(
+        [("a", 0.9, {}), ("b", 0.5, {})],
+        [("b", 2.0, {}), ("c", 0.1, {})],
+    )
+    
+    assert [eid for eid, _ in fused] == ["b", "a", "c"]
+    assert fused[0][1] == pytest.approx(0.7 * 0.5 + 0.3 * 1.0)
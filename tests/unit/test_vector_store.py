@@ -0,0 +1,103 @@
+"""Test vector store."""
+
+import pickle
+import zlib
+
+import faiss
+import numpy as np
+import pytest
+from unittest.mock import Mock
+
+from app.config import settings
+from app.storage.vector_store import VectorStore
+
+DIMENSION = 16
+
+
+async def _embed_batch(texts, batch_size=32):
+    """Deterministic pseudo-random embedding per text."""
+    return np.stack([
+        np.random.default_rng(zlib.crc32(text.encode())).standard_normal(DIMENSION)
+        for text in texts
+    ]).astype("float32")
+
+
+def _embedding_model():
+    """Stand-in embedding model with a small dimension."""
+    model = Mock()
+    model.dimension = DIMENSION
+    model.embed_batch = _embed_batch
+    return model
+
+
+@pytest.fixture
+def index_settings(monkeypatch):
+    """Flat fp32 index, no batching delay and no semantic cache hits."""
+    monkeypatch.setattr(settings, "vector_index_type", "flat")
+    monkeypatch.setattr(settings, "vector_precision", "fp32")
+    monkeypatch.setattr(settings, "search_batch_window_ms", 0.0)
+    return settings
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+async def test_add_search_remove_save_load(temp_dir, index_settings, monkeypatch, index_type):
+    """Test a round trip through add, search, remove, save and load."""
+    monkeypatch.setattr(settings, "vector_index_type", index_type)
+    texts = [f"text {i}" for i in range(10)]
+    
+    store = VectorStore(temp_dir, _embedding_model())
+    await store.initialize()
+    await store.add_embeddings(texts, [f"e{i}" for i in range(10)], [{"n": i} for i in range(10)])
+    
+    results = await store.search("text 3", top_k=3)
+    assert results[0][0] == "e3"
+    assert results[0][2] == {"n": 3}
+    
+    await store.remove_embeddings(["e3", "e7"])
+    assert store.index.ntotal == 8
+    results = await store.search("text 3", top_k=10, threshold=-1.0)
+    assert {eid for eid, _, _ in results} == {f"e{i}" for i in range(10)} - {"e3", "e7"}
+    
+    await store.save()
+    assert (temp_dir / "id_map.npz").exists()
+    
+    loaded = VectorStore(temp_dir, _embedding_model())
+    await loaded.initialize()
+    assert loaded.index.ntotal == 8
+    assert loaded.next_id == store.next_id
+    
+    results = await loaded.search("text 5", top_k=1)
+    assert results[0][0] == "e5"
+    assert results[0][2] == {"n": 5}
+    
+    # New IDs continue past removed ones
+    await loaded.add_embeddings(["text 10"], ["e10"])
+    assert (await loaded.search("text 10", top_k=1))[0][0] == "e10"
+    assert (await loaded.search("text 9", top_k=1))[0][0] == "e9"
+
+
+@pytest.mark.asyncio
+async def test_load_legacy_pickle_id_map(temp_dir, index_settings):
+    """Test loading a bare flat index with a pickled ID map, then saving it as npz."""
+    texts = [f"text {i}" for i in range(4)]
+    vectors = await _embed_batch(texts)
+    faiss.normalize_L2(vectors)
+    index = faiss.IndexFlatIP(DIMENSION)
+    index.add(vectors)
+    faiss.write_index(index, str(temp_dir / "faiss.index"))
+    with open(temp_dir / "id_map.pkl", "wb") as f:
+        pickle.dump({i: {"id": f"e{i}", "metadata": {"n": i}} for i in range(4)}, f)
+    
+    store = VectorStore(temp_dir, _embedding_model())
+    await store.initialize()
+    results = await store.search("text 2", top_k=1)
+    assert results[0][0] == "e2"
+    assert results[0][2] == {"n": 2}
+    
+    await store.save()
+    assert not (temp_dir / "id_map.pkl").exists()
+    
+    loaded = VectorStore(temp_dir, _embedding_model())
+    await loaded.initialize()
+    assert (await loaded.search("text 1", top_k=1))[0][0] == "e1"
@@ -0,0 +1,85 @@
+"""Test folder watcher debouncing."""
+
+import asyncio
+from pathlib import Path
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from app.ingest import watcher as watcher_module
+from app.ingest.watcher import FileChangeHandler
+
+
+@pytest.fixture
+def fast_debounce(monkeypatch):
+    """Shorten the quiet period so tests run quickly."""
+    monkeypatch.setattr(watcher_module, "DEBOUNCE_SECONDS", 0.05)
+
+
+@pytest.mark.asyncio
+async def test_burst_of_events_ingests_once(fast_debounce):
+    """Test repeated events for one file coalesce into a single ingest."""
+    watcher = Mock()
+    watcher.ingest_file = AsyncMock()
+    handler = FileChangeHandler(watcher)
+    
+    path = Path("/data/notes.md")
+    for _ in range(5):
+        handler.schedule_ingestion(path)
+        await asyncio.sleep(0.01)
+    handler.schedule_ingestion(Path("/data/other.md"))
+    
+    await asyncio.sleep(0.2)
+    
+    assert sorted(call.args[0] for call in watcher.ingest_file.await_args_list) == [
+        Path("/data/notes.md"), Path("/data/other.md")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_change_during_ingest_reruns_after(fast_debounce):
+    """Test a change while a file is being ingested triggers exactly one more ingest."""
+    release = asyncio.Event()
+    calls = []
+    
+    async def ingest_file(file_path):
+        calls.append(file_path)
+        if len(calls) == 1:
+            await release.wait()
+    
+    watcher = Mock()
+    watcher.ingest_file = ingest_file
+    handler = FileChangeHandler(watcher)
+    
+    path = Path("/data/notes.md")
+    handler.schedule_ingestion(path)
+    await asyncio.sleep(0.1)
+    assert calls == [path]
+    
+    # Changes while in flight wait for the running ingest instead of overlapping it
+    handler.schedule_ingestion(path)
+    handler.schedule_ingestion(path)
+    await asyncio.sleep(0.1)
+    assert calls == [path]
+    
+    release.set()
+    await asyncio.sleep(0.2)
+    assert calls == [path, path]
+
+
+@pytest.mark.asyncio
+async def test_deletion_cancels_pending_ingest(fast_debounce):
+    """Test deleting a file drops its pending debounced ingest."""
+    watcher = Mock()
+    watcher.ingest_file = AsyncMock()
+    watcher.delete_file = AsyncMock()
+    handler = FileChangeHandler(watcher)
+    
+    path = Path("/data/notes.md")
+    handler.schedule_ingestion(path)
+    await asyncio.sleep(0.01)
+    handler.schedule_deletion(path)
+    await asyncio.sleep(0.2)
+    
+    watcher.ingest_file.assert_not_awaited()
+    watcher.delete_file.assert_awaited_once_with(path)